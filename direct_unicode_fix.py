@@ -5,83 +5,65 @@ Fixes Unicode issues with minimal complexity
 """
 
 import json
-import re
 import os
-from pathlib import Path
+import sys
 from dotenv import load_dotenv
 from turso_python import TursoClient
+from unicode_fix_fast import fix_unicode_bytes, collapse_excess_zwj, normalize_nfc
 
 # Load environment variables
 load_dotenv()
 
-def fix_unicode_text(text):
+# Buffer size for reading/writing chapter JSON files
+IO_BUFFER_SIZE = 1 << 20
+
+# Update statements shared by every chapter, so the exact same SQL text is
+# sent for each call and the server can reuse its cached statement
+CHAPTER_UPDATE_SQL = (
+    "UPDATE chapters SET title_pali = ?, title_english = ?, title_sinhala = ? "
+    "WHERE id = ?"
+)
+SECTION_UPDATE_SQL = (
+    "UPDATE sections SET pali = ?, english = ?, sinhala = ?, pali_title = ? "
+    "WHERE chapter_id = ? AND section_number = ?"
+)
+
+# Strings shorter than this (titles, ids, numbers) are interned on load
+INTERN_MAX_LENGTH = 32
+
+def intern_pairs(pairs):
     """
-    Fix all Unicode issues in text
+    object_pairs_hook that interns keys and short string values so repeated
+    strings across the JSON tree share one object
     """
-    if not text:
-        return text, 0
-    
-    fixes = 0
-    
-    # 1. Fix #zwj; placeholders
-    if '#zwj;' in text:
-        count = text.count('#zwj;')
-        text = text.replace('#zwj;', '\u200D')
-        fixes += count
-    
-    # 2. Fix &zwj; HTML entities
-    if '&zwj;' in text:
-        count = text.count('&zwj;')
-        text = text.replace('&zwj;', '\u200D')
-        fixes += count
-    
-    # 3. Fix {U+200D} literal notation
-    def replace_unicode_literal(match):
-        nonlocal fixes
-        try:
-            hex_code = match.group(1)
-            char_code = int(hex_code, 16)
-            fixes += 1
-            return chr(char_code)
-        except:
-            return match.group(0)
-    
-    text = re.sub(r'\{U\+([0-9A-Fa-f]+)\}', replace_unicode_literal, text)
-    
-    # 4. Fix Unicode escapes
-    escapes = {
-        '\\u0DCA': '\u0DCA',
-        '\\u200D': '\u200D',
-        '\\u200C': '\u200C',
-        '\\u0D9A': '\u0D9A',
-        '\\u0DBB': '\u0DBB',
-        '\\u0DBA': '\u0DBA',
-        '\\u0DB8': '\u0DB8',
+    return {
+        sys.intern(k): sys.intern(v) if isinstance(v, str) and len(v) < INTERN_MAX_LENGTH else v
+        for k, v in pairs
     }
-    
-    for escape, char in escapes.items():
-        if escape in text:
-            count = text.count(escape)
-            text = text.replace(escape, char)
-            fixes += count
-    
-    # 5. Clean excessive ZWJ
-    excessive = re.findall(r'\u200D{2,}', text)
-    if excessive:
-        fixes += sum(len(match) - 1 for match in excessive)
-        text = re.sub(r'\u200D{2,}', '\u200D', text)
-    
-    return text, fixes
 
-def fix_json_file(file_path):
+def iter_json(root):
+    """
+    Recursively yield JSON file paths under root using os.scandir
+    """
+    with os.scandir(root) as it:
+        for entry in it:
+            if entry.is_dir(follow_symlinks=False):
+                yield from iter_json(entry.path)
+            elif entry.name.endswith('.json'):
+                yield entry.path
+
+def fix_json_file(file_path, nfc=False):
     """
-    Fix Unicode issues in a JSON file
+    Fix Unicode issues in a JSON file, optionally NFC-normalizing every string
     """
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        with open(file_path, 'rb', buffering=IO_BUFFER_SIZE) as f:
+            raw = f.read()
         
-        total_fixes = 0
+        # Literal fixes target ASCII sequences, so run them on the raw bytes
+        # before decoding; only ZWJ collapsing needs the parsed strings
+        raw, total_fixes = fix_unicode_bytes(raw)
+        data = json.loads(raw, object_pairs_hook=intern_pairs)
         
         def fix_recursive(obj):
             nonlocal total_fixes
@@ -90,8 +72,11 @@ def fix_json_file(file_path):
             elif isinstance(obj, list):
                 return [fix_recursive(item) for item in obj]
             elif isinstance(obj, str):
-                fixed_text, fixes = fix_unicode_text(obj)
+                fixed_text, fixes = collapse_excess_zwj(obj)
                 total_fixes += fixes
+                if nfc:
+                    fixed_text, fixes = normalize_nfc(fixed_text)
+                    total_fixes += fixes
                 return fixed_text
             else:
                 return obj
@@ -99,8 +84,20 @@ def fix_json_file(file_path):
         fixed_data = fix_recursive(data)
         
         if total_fixes > 0:
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(fixed_data, f, ensure_ascii=False, indent=2)
+            # Write to a temp file and swap it in so an interrupted run
+            # never leaves a half-written chapter behind
+            tmp_path = f"{file_path}.tmp"
+            try:
+                with open(tmp_path, 'w', encoding='utf-8', buffering=IO_BUFFER_SIZE) as f:
+                    json.dump(fixed_data, f, ensure_ascii=False, indent=2)
+                os.replace(tmp_path, file_path)
+            except BaseException:
+                # Don't leave a partial temp file next to the chapter
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+                raise
         
         return True, total_fixes
         
@@ -118,11 +115,7 @@ def update_database_chapter(file_path, client):
         chapter_id = chapter_data['id']
         
         # Update chapter
-        client.execute_query("""
-            UPDATE chapters 
-            SET title_pali = ?, title_english = ?, title_sinhala = ?
-            WHERE id = ?
-        """, [
+        client.execute_query(CHAPTER_UPDATE_SQL, [
             chapter_data['title']['pali'],
             chapter_data['title']['english'], 
             chapter_data['title']['sinhala'],
@@ -132,11 +125,7 @@ def update_database_chapter(file_path, client):
         # Update sections
         sections_updated = 0
         for section in chapter_data['sections']:
-            client.execute_query("""
-                UPDATE sections 
-                SET pali = ?, english = ?, sinhala = ?, pali_title = ?
-                WHERE chapter_id = ? AND section_number = ?
-            """, [
+            client.execute_query(SECTION_UPDATE_SQL, [
                 section['pali'],
                 section['english'],
                 section['sinhala'],
@@ -159,17 +148,24 @@ def main():
     print("DIRECT UNICODE FIX FOR PRODUCTION")
     print("=" * 60)
     
+    # Optional NFC normalization pass (python direct_unicode_fix.py --nfc)
+    nfc = '--nfc' in sys.argv
+    # List every fixed file in the results (python direct_unicode_fix.py --verbose)
+    verbose = '--verbose' in sys.argv
+    if nfc:
+        print("🔤 NFC normalization enabled")
+    
     # Find files
     json_files = []
     for directory in ["Aṅguttaranikāyo", "Dīghanikāyo", "Majjhimanikāye", "Saṃyuttanikāyo"]:
-        dir_path = Path(directory)
-        if dir_path.exists():
-            json_files.extend(dir_path.rglob("*.json"))
+        if os.path.isdir(directory):
+            json_files.extend(iter_json(directory))
     
     print(f"📁 Found {len(json_files)} files")
     
     # Fix files
     fixed_files = []
+    results = []
     total_fixes = 0
     
     print("\n🔧 Fixing files...")
@@ -177,13 +173,16 @@ def main():
         if i % 50 == 0:
             print(f"   Progress: {i}/{len(json_files)}")
         
-        success, fixes = fix_json_file(file_path)
+        success, fixes = fix_json_file(file_path, nfc=nfc)
         if success and fixes > 0:
             fixed_files.append(file_path)
+            results.append((file_path, fixes))
             total_fixes += fixes
-            print(f"  ✅ {file_path.name}: {fixes} fixes")
     
     print(f"\n📊 RESULTS:")
+    if verbose:
+        for file_path, fixes in results:
+            print(f"  ✅ {os.path.basename(file_path)}: {fixes} fixes")
     print(f"   Files fixed: {len(fixed_files)}")
     print(f"   Total fixes: {total_fixes}")
     
@@ -211,13 +210,13 @@ def main():
         
         db_updated = 0
         for file_path in fixed_files:
-            if 'chapters' in str(file_path):
+            if 'chapters' in file_path:
                 success, sections = update_database_chapter(file_path, client)
                 if success:
-                    print(f"  ✅ DB: {file_path.name} - {sections} sections")
+                    print(f"  ✅ DB: {os.path.basename(file_path)} - {sections} sections")
                     db_updated += 1
                 else:
-                    print(f"  ❌ DB: {file_path.name} - failed")
+                    print(f"  ❌ DB: {os.path.basename(file_path)} - failed")
         
         print(f"\n🎉 COMPLETED!")
         print(f"   Files fixed: {len(fixed_files)}")
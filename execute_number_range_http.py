@@ -5,13 +5,56 @@ This script doesn't require libsql-experimental.
 """
 
 import os
+import re
 import json
 import requests
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from itertools import islice
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
+# Maximum number of UPDATE batches posted concurrently
+MAX_IN_FLIGHT = 8
+
+# Shared session so every request reuses the same keep-alive connections
+_SESSION = requests.Session()
+_SESSION.headers.update({"Content-Type": "application/json"})
+_SESSION.mount("https://", requests.adapters.HTTPAdapter(pool_maxsize=MAX_IN_FLIGHT))
+
+# Single parameterized statement so the server can reuse one cached plan
+UPDATE_SQL = "UPDATE sections SET number_range = ? WHERE chapter_id = ? AND section_number = ?"
+
+# Matches the statements written by generate_number_range_updates.py
+UPDATE_PATTERN = re.compile(
+    r"^UPDATE sections SET number_range = '((?:[^']|'')*)' "
+    r"WHERE chapter_id = '((?:[^']|'')*)' AND section_number = (\d+);$"
+)
+
+def build_update_stmt(statement):
+    """Convert a generated UPDATE statement into a parameterized pipeline stmt."""
+    match = UPDATE_PATTERN.match(statement)
+    if not match:
+        return {"sql": statement}
+    number_range, chapter_id, section_number = match.groups()
+    return {
+        "sql": UPDATE_SQL,
+        "args": [
+            {"type": "text", "value": number_range.replace("''", "'")},
+            {"type": "text", "value": chapter_id.replace("''", "'")},
+            {"type": "integer", "value": section_number},
+        ]
+    }
+
+def iter_updates(path):
+    """Yield UPDATE statements from the SQL file one line at a time."""
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            statement = line.strip()
+            if statement.startswith('UPDATE'):
+                yield statement
+
 def get_turso_config():
     """Get Turso configuration from environment."""
     url = os.getenv("TURSO_DATABASE_URL") or os.getenv("TURSO_DB_URL")
@@ -26,22 +69,22 @@ def get_turso_config():
     
     return url, token
 
+def get_session(token):
+    """Return the shared HTTP session authorized with the given token."""
+    _SESSION.headers["Authorization"] = f"Bearer {token}"
+    return _SESSION
+
 def execute_sql(url, token, sql):
     """Execute SQL using Turso HTTP API."""
     api_url = f"{url}/v2/pipeline"
     
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "Content-Type": "application/json"
-    }
-    
     payload = {
         "requests": [
             {"type": "execute", "stmt": {"sql": sql}}
         ]
     }
     
-    response = requests.post(api_url, headers=headers, json=payload)
+    response = get_session(token).post(api_url, json=payload)
     
     if response.status_code != 200:
         raise Exception(f"HTTP {response.status_code}: {response.text}")
@@ -52,18 +95,13 @@ def execute_query(url, token, sql):
     """Execute a query and return results."""
     api_url = f"{url}/v2/pipeline"
     
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "Content-Type": "application/json"
-    }
-    
     payload = {
         "requests": [
             {"type": "execute", "stmt": {"sql": sql}}
         ]
     }
     
-    response = requests.post(api_url, headers=headers, json=payload)
+    response = get_session(token).post(api_url, json=payload)
     
     if response.status_code != 200:
         raise Exception(f"HTTP {response.status_code}: {response.text}")
@@ -94,65 +132,83 @@ def create_index(url, token):
     except Exception as e:
         print(f"⚠ Index creation: {e}")
 
+def post_batch(url, token, batch):
+    """Send one pipeline batch and return the number of rows it updated."""
+    api_url = f"{url}/v2/pipeline"
+    
+    requests_list = [
+        {"type": "execute", "stmt": build_update_stmt(stmt)}
+        for stmt in batch
+    ]
+    
+    payload = {"requests": requests_list}
+    
+    response = get_session(token).post(api_url, json=payload)
+    
+    if response.status_code != 200:
+        raise Exception(f"HTTP {response.status_code}")
+    
+    result = response.json()
+    updated = 0
+    # Count successful updates
+    for res in result.get("results", []):
+        if res.get("response", {}).get("type") == "ok":
+            rows_affected = res.get("response", {}).get("result", {}).get("rows_affected", 0)
+            if rows_affected > 0:
+                updated += 1
+    return updated
+
 def update_sections(url, token):
     """Update sections with numberRange values."""
     print("\nStep 3: Updating sections with numberRange values...")
     
-    # Read the SQL file
-    with open('number_range_updates.sql', 'r', encoding='utf-8') as f:
-        sql_content = f.read()
-    
-    # Extract UPDATE statements
-    statements = [line.strip() for line in sql_content.split('\n') 
-                  if line.strip().startswith('UPDATE')]
-    
-    print(f"Found {len(statements)} UPDATE statements to execute...")
+    # Stream UPDATE statements from the SQL file
+    statements = iter_updates('number_range_updates.sql')
     
     updated_count = 0
     failed_count = 0
+    executed_count = 0
     
-    # Execute in batches
+    # Execute in batches, keeping up to MAX_IN_FLIGHT batches in flight.
+    # Each batch is a set of independent UPDATE-by-key writes, so order
+    # between batches does not matter.
     batch_size = 10
-    for i in range(0, len(statements), batch_size):
-        batch = statements[i:i+batch_size]
-        
-        try:
-            # Create a batch request
-            api_url = f"{url}/v2/pipeline"
-            headers = {
-                "Authorization": f"Bearer {token}",
-                "Content-Type": "application/json"
-            }
-            
-            requests_list = [
-                {"type": "execute", "stmt": {"sql": stmt}}
-                for stmt in batch
-            ]
-            
-            payload = {"requests": requests_list}
+    batch_num = 0
+    pending = {}
+    
+    def collect(done):
+        nonlocal updated_count, failed_count
+        for future in done:
+            num, batch = pending.pop(future)
+            try:
+                updated_count += future.result()
+            except Exception as e:
+                failed_count += len(batch)
+                print(f"  ✗ Error in batch {num}: {e}")
+    
+    with ThreadPoolExecutor(max_workers=MAX_IN_FLIGHT) as executor:
+        while True:
+            batch = list(islice(statements, batch_size))
+            if not batch:
+                break
+            batch_num += 1
+            executed_count += len(batch)
             
-            response = requests.post(api_url, headers=headers, json=payload)
+            future = executor.submit(post_batch, url, token, batch)
+            pending[future] = (batch_num, batch)
             
-            if response.status_code == 200:
-                result = response.json()
-                # Count successful updates
-                for res in result.get("results", []):
-                    if res.get("response", {}).get("type") == "ok":
-                        rows_affected = res.get("response", {}).get("result", {}).get("rows_affected", 0)
-                        if rows_affected > 0:
-                            updated_count += 1
-            else:
-                failed_count += len(batch)
-                print(f"  ✗ Batch {i//batch_size + 1} failed: {response.status_code}")
+            if len(pending) >= MAX_IN_FLIGHT:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                collect(done)
             
-            if (i + batch_size) % 50 == 0:
-                print(f"  Progress: {min(i + batch_size, len(statements))}/{len(statements)} statements executed...")
+            if executed_count % 50 == 0:
+                print(f"  Progress: {executed_count} statements submitted...")
         
-        except Exception as e:
-            failed_count += len(batch)
-            print(f"  ✗ Error in batch {i//batch_size + 1}: {e}")
+        done, _ = wait(pending)
+        collect(done)
     
-    print(f"\n✓ Completed: {updated_count} sections updated, {failed_count} failed")
+    print(f"\n✓ Executed {executed_count} UPDATE statements")
+    print(f"✓ Completed: {updated_count} sections updated, {failed_count} failed")
     return updated_count
 
 def verify_migration(url, token):
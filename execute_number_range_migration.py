@@ -8,6 +8,7 @@ Run this after ensuring libsql-experimental is installed:
 """
 
 import os
+import re
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -24,6 +25,31 @@ except ImportError:
     print("  2. number_range_updates.sql")
     exit(1)
 
+# Single parameterized statement, parsed once and reused for every row
+UPDATE_SQL = "UPDATE sections SET number_range = ? WHERE chapter_id = ? AND section_number = ?"
+
+# Matches the statements written by generate_number_range_updates.py
+UPDATE_PATTERN = re.compile(
+    r"^UPDATE sections SET number_range = '((?:[^']|'')*)' "
+    r"WHERE chapter_id = '((?:[^']|'')*)' AND section_number = (\d+);$"
+)
+
+def parse_update(statement):
+    """Parse a generated UPDATE statement into (number_range, chapter_id, section_number)."""
+    match = UPDATE_PATTERN.match(statement)
+    if not match:
+        return None
+    number_range, chapter_id, section_number = match.groups()
+    return number_range.replace("''", "'"), chapter_id.replace("''", "'"), int(section_number)
+
+def iter_updates(path):
+    """Yield UPDATE statements from the SQL file one line at a time."""
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            statement = line.strip()
+            if statement.startswith('UPDATE'):
+                yield statement
+
 def get_turso_connection():
     """Create and return a Turso database connection."""
     url = os.getenv("TURSO_DATABASE_URL")
@@ -64,31 +90,31 @@ def execute_updates(conn):
     
     print("\nStep 3: Updating sections with numberRange values...")
     
-    # Read the SQL file
-    with open('number_range_updates.sql', 'r', encoding='utf-8') as f:
-        sql_content = f.read()
-    
-    # Extract UPDATE statements
-    statements = [line.strip() for line in sql_content.split('\n') 
-                  if line.strip().startswith('UPDATE')]
-    
-    print(f"Found {len(statements)} UPDATE statements to execute...")
+    # Stream UPDATE statements from the SQL file
+    statements = iter_updates('number_range_updates.sql')
     
     updated_count = 0
+    executed_count = 0
     for i, statement in enumerate(statements, 1):
+        executed_count = i
         try:
-            cursor.execute(statement)
+            params = parse_update(statement)
+            if params:
+                cursor.execute(UPDATE_SQL, params)
+            else:
+                cursor.execute(statement)
             if cursor.rowcount > 0:
                 updated_count += 1
             
             if i % 20 == 0:
-                print(f"  Progress: {i}/{len(statements)} statements executed...")
+                print(f"  Progress: {i} statements executed...")
         except Exception as e:
             print(f"  ✗ Error on statement {i}: {e}")
             print(f"    Statement: {statement[:100]}...")
     
     conn.commit()
-    print(f"\n✓ Successfully updated {updated_count} sections")
+    print(f"\n✓ Executed {executed_count} UPDATE statements")
+    print(f"✓ Successfully updated {updated_count} sections")
     return updated_count
 
 def verify_migration(conn):
@@ -5,6 +5,8 @@ Extracts all nipāta PDFs and creates structured JSON files
 
 import sys
 import os
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 
 # Import the correct Aṅguttara extractor class
@@ -18,6 +20,39 @@ if sys.platform == 'win32':
         pass
 
 
+def _process_book(book_info, base_pdf_dir, base_output_dir):
+    """
+    Extract a single nipāta book (runs in a worker process)
+    
+    Returns:
+        Tuple of (status, book name, error) where status is 'ok', 'fail' or 'skip'
+    """
+    pdf_path = os.path.join(base_pdf_dir, book_info['pdf_filename'])
+    output_dir = os.path.join(base_output_dir, book_info['name'])
+    
+    # Check if PDF exists
+    if not os.path.exists(pdf_path):
+        return 'skip', book_info['name'], f"PDF not found at {pdf_path}"
+    
+    # Create book config
+    book_config = {
+        'name': book_info['name'],
+        'pali_title': book_info['pali_title'],
+        'english_title': '',
+        'sinhala_title': '',
+        'nipata_num': book_info['nipata_num'],
+        'starting_an': book_info['starting_an']
+    }
+    
+    try:
+        # Create extractor and process
+        extractor = AnguttaraVaggaExtractor(pdf_path, output_dir, book_config)
+        extractor.process()
+        return 'ok', book_info['name'], None
+    except Exception as e:
+        return 'fail', book_info['name'], f"{e}\n{traceback.format_exc()}"
+
+
 def main():
     """Extract all Aṅguttara Nikāya PDFs"""
     
@@ -121,41 +156,26 @@ def main():
     failed = 0
     skipped = 0
     
-    for i, book_info in enumerate(books, 1):
-        print("\n" + "=" * 80)
-        print(f"[{i}/{len(books)}] {book_info['name']}")
-        print("=" * 80)
-        
-        pdf_path = os.path.join(base_pdf_dir, book_info['pdf_filename'])
-        output_dir = os.path.join(base_output_dir, book_info['name'])
-        
-        # Check if PDF exists
-        if not os.path.exists(pdf_path):
-            print(f"⚠️  Skipping: PDF not found at {pdf_path}")
-            skipped += 1
-            continue
-        
-        # Create book config
-        book_config = {
-            'name': book_info['name'],
-            'pali_title': book_info['pali_title'],
-            'english_title': '',
-            'sinhala_title': '',
-            'nipata_num': book_info['nipata_num'],
-            'starting_an': book_info['starting_an']
-        }
+    # Books share no state, so extract them in parallel processes
+    max_workers = min(len(books), os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(_process_book, book_info, base_pdf_dir, base_output_dir)
+            for book_info in books
+        ]
         
-        try:
-            # Create extractor and process
-            extractor = AnguttaraVaggaExtractor(pdf_path, output_dir, book_config)
-            extractor.process()
-            successful += 1
+        for i, future in enumerate(as_completed(futures), 1):
+            status, name, error = future.result()
             
-        except Exception as e:
-            print(f"\n❌ Error processing {book_info['name']}: {str(e)}")
-            import traceback
-            traceback.print_exc()
-            failed += 1
+            if status == 'ok':
+                print(f"\n[{i}/{len(books)}] ✅ {name}")
+                successful += 1
+            elif status == 'skip':
+                print(f"\n[{i}/{len(books)}] ⚠️  Skipping {name}: {error}")
+                skipped += 1
+            else:
+                print(f"\n[{i}/{len(books)}] ❌ Error processing {name}: {error}")
+                failed += 1
     
     # Final summary
     print("\n" + "=" * 80)
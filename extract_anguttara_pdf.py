@@ -8,8 +8,17 @@ import fitz  # PyMuPDF
 import json
 import re
 import os
+import functools
+import time
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Tuple, Optional
+from typing import List, Dict, Tuple, Optional, Iterable, Iterator
+
+try:
+    import orjson  # Optional: much faster JSON encoding
+except ImportError:
+    orjson = None
 
 # Fix Windows console encoding
 if sys.platform == 'win32':
@@ -18,6 +27,51 @@ if sys.platform == 'win32':
     except:
         pass
 
+@functools.lru_cache(maxsize=64)
+def _get_pattern(pattern: str, flags: int = 0) -> re.Pattern:
+    """
+    Compile a pattern built at runtime once and reuse it on later calls
+
+    Fixed patterns live in the module-level constants below; this covers
+    patterns assembled from configuration, such as the metadata filters.
+    """
+    return re.compile(pattern, flags)
+
+# Write buffers for the extracted full-text file and JSON output files
+FULL_TEXT_BUFFER_SIZE = 1 << 20
+JSON_BUFFER_SIZE = 1 << 20
+
+def write_json(output_path: str, data: Dict):
+    """
+    Write data as indented UTF-8 JSON, using orjson when it is installed
+
+    The document is serialized in memory and emitted with a single write
+    through a large buffer instead of json.dump's many small writes.
+    """
+    if orjson is not None:
+        with open(output_path, 'wb', buffering=JSON_BUFFER_SIZE) as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+    else:
+        with open(output_path, 'w', encoding='utf-8', buffering=JSON_BUFFER_SIZE) as f:
+            f.write(json.dumps(data, ensure_ascii=False, indent=2))
+
+# Worker threads used to build and write sutta JSON files
+SUTTA_WRITE_WORKERS = 8
+
+
+# Sutta title: number, dot, space, name ending with suttaṃ
+SUTTA_TITLE_PATTERN = re.compile(r'^(\d+)\.\s+(.+suttaṃ)$', re.IGNORECASE)
+
+# Numbered section start within a sutta
+SECTION_PATTERN = re.compile(r'^(\d+)\.\s+(.+)')
+
+# Leading/trailing whitespace on each line (same characters as str.strip)
+LINE_STRIP_PATTERN = re.compile(r'^[^\S\n]+|[^\S\n]+$', re.MULTILINE)
+
+# Already-stripped lines that are empty or contain only a page number,
+# including their line break
+BLANK_OR_NUMBER_LINE_PATTERN = re.compile(r'^\d*\n', re.MULTILINE)
+
 class AnguttaraPDFExtractor:
     """Extract Pali text from Aṅguttara Nikāya PDF and create sutta JSON files"""
     
@@ -33,7 +87,6 @@ class AnguttaraPDFExtractor:
         self.pdf_path = pdf_path
         self.output_dir = output_dir
         self.book_config = book_config
-        self.full_text = ""
         
         # Patterns to remove (metadata)
         self.remove_patterns = [
@@ -41,148 +94,148 @@ class AnguttaraPDFExtractor:
             r'www\.tipitaka\.org',
             r'Vipassana.*Research Institute',
         ]
+        # All remove patterns fused into one alternation so each line is scanned once
+        self.remove_union = _get_pattern(
+            '|'.join(f'(?:{pattern})' for pattern in self.remove_patterns),
+            re.IGNORECASE
+        )
         
         # Create output directory if it doesn't exist
         os.makedirs(output_dir, exist_ok=True)
     
-    def extract_text_from_pdf(self) -> str:
-        """Extract text from PDF"""
+    def iter_page_texts(self) -> Iterator[str]:
+        """Yield the text of each non-blank PDF page as it is read"""
         print(f"Opening PDF: {self.pdf_path}")
         doc = fitz.open(self.pdf_path)
+        page_count = len(doc)
+        
+        try:
+            for page_num, page in enumerate(doc):
+                # Plain extraction order is all the regex parsing needs, so
+                # never ask MuPDF to re-sort blocks into reading order
+                text = page.get_text("text", sort=False)
+                if text.strip():
+                    yield text
+                
+                if (page_num + 1) % 10 == 0:
+                    print(f"  Processed {page_num + 1}/{page_count} pages...")
+        finally:
+            doc.close()
         
-        all_text = []
-        
-        for page_num in range(len(doc)):
-            page = doc[page_num]
-            text = page.get_text("text")
-            if text.strip():
-                all_text.append(text)
-            
-            if (page_num + 1) % 10 == 0:
-                print(f"  Processed {page_num + 1}/{len(doc)} pages...")
-        
-        print(f"✓ Extracted text from {len(doc)} pages")
-        doc.close()
-        
-        return '\n'.join(all_text)
+        print(f"✓ Extracted text from {page_count} pages")
     
     def clean_text(self, text: str) -> str:
         """Clean extracted text"""
-        print("Cleaning text...")
-        
-        lines = text.split('\n')
-        cleaned_lines = []
-        
-        for line in lines:
-            line = line.strip()
-            if not line:
-                continue
-            
-            for pattern in self.remove_patterns:
-                line = re.sub(pattern, '', line, flags=re.IGNORECASE).strip()
-            
-            if not line or re.match(r'^\s*\d+\s*$', line):
-                continue
-            
-            cleaned_lines.append(line)
+        # Work on the whole text at once so the per-line loop runs inside
+        # the regex engine: remove metadata, strip every line, then drop
+        # blank and page-number-only lines
+        text = self.remove_union.sub('', text)
+        text = LINE_STRIP_PATTERN.sub('', text)
+        return BLANK_OR_NUMBER_LINE_PATTERN.sub('', text + '\n')[:-1]
+    
+    def iter_clean_lines(self) -> Iterator[str]:
+        """
+        Yield cleaned lines page by page
         
-        cleaned_text = '\n'.join(cleaned_lines)
-        print(f"✓ Cleaned text: {len(cleaned_lines)} lines")
-        return cleaned_text
+        Cleaning is line-local, so cleaning each page on its own gives the
+        same lines as cleaning the joined text, without holding the whole
+        book in memory.
+        """
+        for page_text in self.iter_page_texts():
+            cleaned = self.clean_text(page_text)
+            if cleaned:
+                yield from cleaned.split('\n')
     
-    def save_full_text(self, text: str):
-        """Save the full extracted text to a file"""
+    def save_full_text(self, lines: Iterable[str]) -> Iterator[str]:
+        """Save the extracted lines to a file while passing them through"""
         filename = f"{self.book_config['name']}_pali_extracted.txt"
         output_path = os.path.join(self.output_dir, filename)
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(text)
+        line_count = 0
+        # Binary, large-buffered writes: no text-mode codec or newline
+        # translation layer between the lines and the file
+        with open(output_path, 'wb', buffering=FULL_TEXT_BUFFER_SIZE) as f:
+            for line in lines:
+                if line_count:
+                    f.write(b'\n')
+                f.write(line.encode('utf-8'))
+                line_count += 1
+                yield line
+        print(f"✓ Cleaned text: {line_count} lines")
         print(f"✓ Saved full text to: {output_path}")
     
-    def detect_suttas(self, text: str) -> List[Dict]:
+    def iter_suttas(self, lines: Iterable[str]) -> Iterator[Tuple[Dict, List[str]]]:
         """
-        Detect individual suttas from the text
+        Detect individual suttas and yield each one with its lines
         
         In Aṅguttara Nikāya, suttas are marked like:
         1. Mettāsuttaṃ
         2. Paññāsuttaṃ
         etc.
+        
+        A sutta runs from its title line up to the next title (or the end of
+        the text) and is yielded as soon as the next title is seen.
         """
         print("\nDetecting suttas from PDF...")
+        start_time = time.perf_counter()
         
-        lines = text.split('\n')
-        suttas = []
-        sutta_counter = 1
+        sutta_count = 0
+        current_sutta = None
+        current_lines: List[str] = []
         
+        # Lines come from clean_text, which already strips every line
         for i, line in enumerate(lines):
-            line_stripped = line.strip()
-            
             # Look for sutta titles: number, dot, space, name ending with suttaṃ
-            match = re.match(r'^(\d+)\.\s+(.+suttaṃ)$', line_stripped, re.IGNORECASE)
+            match = SUTTA_TITLE_PATTERN.match(line)
             if match:
+                if current_sutta is not None:
+                    yield current_sutta, current_lines
+                
                 sutta_num = int(match.group(1))
                 sutta_title = match.group(2)
                 
                 # Generate ID based on book's starting AN number
-                an_number = self.book_config['starting_an'] + len(suttas)
+                an_number = self.book_config['starting_an'] + sutta_count
                 sutta_id = f"an{self.book_config['nipata_num']}.{an_number}"
+                sutta_count += 1
                 
-                suttas.append({
+                current_sutta = {
                     'id': sutta_id,
                     'number': sutta_num,
                     'title': sutta_title,
                     'an_number': an_number,
                     'line_num': i
-                })
-                print(f"  ✓ Found sutta {sutta_num}: {sutta_title} ({sutta_id})")
-        
-        print(f"\n✓ Detected {len(suttas)} suttas")
-        return suttas
-    
-    def find_sutta_boundaries(self, text: str, suttas: List[Dict]) -> List[Tuple[int, int, Dict]]:
-        """Find the start and end positions of each sutta"""
-        print("\nFinding sutta boundaries...")
-        
-        lines = text.split('\n')
-        boundaries = []
-        
-        for i, sutta_info in enumerate(suttas):
-            start_line = sutta_info['line_num']
-            
-            # Find end (start of next sutta or end of file)
-            if i + 1 < len(suttas):
-                end_line = suttas[i + 1]['line_num']
-            else:
-                end_line = len(lines)
+                }
+                current_lines = []
             
-            print(f"  ✓ {sutta_info['title']}: lines {start_line} to {end_line}")
-            boundaries.append((start_line, end_line, sutta_info))
+            if current_sutta is not None:
+                current_lines.append(line)
+        
+        if current_sutta is not None:
+            yield current_sutta, current_lines
         
-        return boundaries
+        elapsed = time.perf_counter() - start_time
+        print(f"\n✓ Detected {sutta_count} suttas in {elapsed:.2f}s")
     
-    def extract_sections_from_sutta(self, sutta_text: str) -> List[Dict]:
+    def extract_sections_from_sutta(self, sutta_lines: List[str]) -> List[Dict]:
         """
-        Extract numbered sections from a sutta
+        Extract numbered sections from a sutta's lines
         
         Sections are numbered like:
         1. Evaṃ me sutaṃ...
         2. ''Aṭṭhime, bhikkhave...
         """
-        lines = sutta_text.split('\n')
         sections = []
         current_section = None
         current_lines = []
         
-        # Skip the first line (sutta title)
-        start_idx = 1
-        
-        for i in range(start_idx, len(lines)):
-            line_stripped = lines[i].strip()
-            
+        # Skip the first line (sutta title) without copying the list;
+        # lines are already stripped by clean_text
+        for line_stripped in islice(sutta_lines, 1, None):
             if not line_stripped:
                 continue
             
             # Check for numbered section start
-            section_match = re.match(r'^(\d+)\.\s+(.+)', line_stripped)
+            section_match = SECTION_PATTERN.match(line_stripped)
             
             if section_match:
                 # Save previous section
@@ -213,9 +266,9 @@ class AnguttaraPDFExtractor:
         
         return sections
     
-    def create_sutta_json(self, sutta_info: Dict, sutta_text: str) -> Dict:
+    def create_sutta_json(self, sutta_info: Dict, sutta_lines: List[str]) -> Dict:
         """Create a JSON structure for a sutta"""
-        sections = self.extract_sections_from_sutta(sutta_text)
+        sections = self.extract_sections_from_sutta(sutta_lines)
         
         sutta_json = {
             "id": sutta_info['id'],
@@ -229,18 +282,12 @@ class AnguttaraPDFExtractor:
         
         return sutta_json
     
-    def save_sutta_json(self, sutta_info: Dict, sutta_json: Dict):
-        """Save a sutta JSON to a file"""
+    def save_sutta_json(self, sutta_info: Dict, sutta_json: Dict, suttas_dir: str):
+        """Save a sutta JSON to a file in suttas_dir (which must already exist)"""
         filename = f"{sutta_info['id']}-{sutta_info['title']}.json"
-        output_path = os.path.join(self.output_dir, "suttas", filename)
-        
-        # Create suttas directory if it doesn't exist
-        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        output_path = os.path.join(suttas_dir, filename)
         
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(sutta_json, f, ensure_ascii=False, indent=2)
-        
-        print(f"  ✓ Saved: {filename} ({len(sutta_json['sections'])} sections)")
+        write_json(output_path, sutta_json)
     
     def create_book_json(self, suttas: List[Dict]):
         """Create a book.json file with metadata about all suttas"""
@@ -265,8 +312,7 @@ class AnguttaraPDFExtractor:
         }
         
         output_path = os.path.join(self.output_dir, "book.json")
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(book_json, f, ensure_ascii=False, indent=2)
+        write_json(output_path, book_json)
         
         print(f"\n✓ Saved book metadata: book.json")
     
@@ -276,48 +322,42 @@ class AnguttaraPDFExtractor:
         print(f"{self.book_config['name']} PDF Extraction")
         print("=" * 70)
         
-        # Step 1: Extract text
-        print("\n[1/6] Extracting text from PDF...")
-        self.full_text = self.extract_text_from_pdf()
-        
-        # Step 2: Clean text
-        print("\n[2/6] Cleaning text...")
-        self.full_text = self.clean_text(self.full_text)
-        
-        # Step 3: Save full text
-        print("\n[3/6] Saving full extracted text...")
-        self.save_full_text(self.full_text)
-        
-        # Step 4: Detect suttas
-        print("\n[4/6] Detecting suttas...")
-        suttas = self.detect_suttas(self.full_text)
-        
-        # Step 5: Find sutta boundaries
-        print("\n[5/6] Finding sutta boundaries...")
-        boundaries = self.find_sutta_boundaries(self.full_text, suttas)
-        
-        # Step 6: Process each sutta
-        print("\n[6/6] Creating sutta JSON files...")
-        lines = self.full_text.split('\n')
+        # Pages are read, cleaned, saved to the full-text file and split into
+        # suttas in a single streaming pass; each sutta is handed to the
+        # thread pool to build and write its JSON as soon as it is complete
+        print("\n[1/2] Extracting suttas from PDF...")
+        suttas = []
         
-        for start_line, end_line, sutta_info in boundaries:
-            sutta_lines = lines[start_line:end_line]
-            sutta_text = '\n'.join(sutta_lines)
-            
-            # Create sutta JSON
-            sutta_json = self.create_sutta_json(sutta_info, sutta_text)
+        # Create suttas directory once, before any sutta is written
+        suttas_dir = os.path.join(self.output_dir, "suttas")
+        os.makedirs(suttas_dir, exist_ok=True)
+        
+        def build_and_save(sutta_info, sutta_lines):
+            # Create and save sutta JSON
+            sutta_json = self.create_sutta_json(sutta_info, sutta_lines)
+            self.save_sutta_json(sutta_info, sutta_json, suttas_dir)
+        
+        with ThreadPoolExecutor(max_workers=SUTTA_WRITE_WORKERS) as executor:
+            futures = []
+            lines = self.save_full_text(self.iter_clean_lines())
+            for sutta_info, sutta_lines in self.iter_suttas(lines):
+                suttas.append(sutta_info)
+                futures.append(executor.submit(build_and_save, sutta_info, sutta_lines))
             
-            # Save sutta JSON
-            self.save_sutta_json(sutta_info, sutta_json)
+            for future in futures:
+                future.result()
+        
+        print(f"✓ Saved {len(suttas)} sutta JSON files")
         
         # Create book.json
+        print("\n[2/2] Creating book metadata...")
         self.create_book_json(suttas)
         
         print("\n" + "=" * 70)
         print("✅ Extraction Complete!")
         print("=" * 70)
         print(f"\nOutput directory: {self.output_dir}")
-        print(f"Sutta JSONs: {os.path.join(self.output_dir, 'suttas')}")
+        print(f"Sutta JSONs: {suttas_dir}")
         print(f"Book metadata: {os.path.join(self.output_dir, 'book.json')}")
 
 
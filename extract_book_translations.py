@@ -6,9 +6,26 @@ and creates a folder with clean JSON files for manual translation.
 """
 
 import json
+import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import shutil
 
+try:
+    import orjson  # Optional: much faster JSON parsing/encoding
+except ImportError:
+    orjson = None
+
+# Worker threads used to process book files; the work is disk-bound
+BOOK_WORKERS = 16
+
+# Translation fields cleared wherever they appear
+_TRANSLATION_KEYS = frozenset(('english', 'sinhala'))
+
+# Fields cleared when they hold plain text; dict values are walked so their
+# English and Sinhala fields are cleared instead
+_DESCRIPTION_KEYS = frozenset(('description', 'summary'))
+
 class BookTranslationExtractor:
     def __init__(self):
         self.output_folder = Path("book_translations_for_manual_work")
@@ -21,48 +38,42 @@ class BookTranslationExtractor:
         self.processed_files = []
     
     def clear_translations(self, obj):
-        """Recursively clear English and Sinhala translations from an object"""
-        if isinstance(obj, dict):
-            # Clear English and Sinhala fields
-            if 'english' in obj:
-                obj['english'] = ""
-            if 'sinhala' in obj:
-                obj['sinhala'] = ""
-            
-            # Clear description and summary fields that might have bad translations
-            if 'description' in obj:
-                if isinstance(obj['description'], dict):
-                    if 'english' in obj['description']:
-                        obj['description']['english'] = ""
-                    if 'sinhala' in obj['description']:
-                        obj['description']['sinhala'] = ""
-                elif isinstance(obj['description'], str):
-                    obj['description'] = ""
+        """Clear English and Sinhala translations from an object and everything nested in it"""
+        # Walk the tree with an explicit stack, visiting each dict once
+        stack = [obj]
+        while stack:
+            node = stack.pop()
             
-            if 'summary' in obj:
-                if isinstance(obj['summary'], dict):
-                    if 'english' in obj['summary']:
-                        obj['summary']['english'] = ""
-                    if 'sinhala' in obj['summary']:
-                        obj['summary']['sinhala'] = ""
-                elif isinstance(obj['summary'], str):
-                    obj['summary'] = ""
+            if isinstance(node, dict):
+                for key, value in node.items():
+                    if key in _TRANSLATION_KEYS:
+                        # Clear English and Sinhala fields
+                        node[key] = ""
+                    elif key in _DESCRIPTION_KEYS and isinstance(value, str):
+                        # Plain-text description/summary fields might have bad translations
+                        node[key] = ""
+                    elif isinstance(value, (dict, list)):
+                        # Nested objects (including description/summary dicts)
+                        stack.append(value)
             
-            # Recursively process nested objects
-            for key, value in obj.items():
-                self.clear_translations(value)
-        
-        elif isinstance(obj, list):
-            # Process each item in the list
-            for item in obj:
-                self.clear_translations(item)
+            elif isinstance(node, list):
+                # Process each item in the list
+                stack.extend(item for item in node if isinstance(item, (dict, list)))
     
     def process_book_file(self, book_path, collection_name, book_name):
-        """Process a single book.json file"""
+        """
+        Process a single book.json file
+        
+        Returns:
+            The reference record for the output file, or None on error
+        """
         try:
             # Read the original file
-            with open(book_path, 'r', encoding='utf-8') as f:
-                book_data = json.load(f)
+            if orjson is not None:
+                book_data = orjson.loads(book_path.read_bytes())
+            else:
+                with open(book_path, 'r', encoding='utf-8') as f:
+                    book_data = json.load(f)
             
             # Clear all English and Sinhala translations
             self.clear_translations(book_data)
@@ -73,47 +84,82 @@ class BookTranslationExtractor:
             
             # Save the cleaned file
             output_file = collection_dir / f"{book_name}_book.json"
-            with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump(book_data, f, ensure_ascii=False, indent=2)
+            if orjson is not None:
+                output_file.write_bytes(orjson.dumps(book_data, option=orjson.OPT_INDENT_2))
+            else:
+                with open(output_file, 'w', encoding='utf-8') as f:
+                    json.dump(book_data, f, ensure_ascii=False, indent=2)
             
-            # Track the file for reference
-            self.processed_files.append({
+            # Record the file for reference
+            return {
                 "original_path": str(book_path),
                 "output_path": str(output_file),
                 "collection": collection_name,
                 "book": book_name
-            })
-            
-            return True
+            }
             
         except Exception as e:
             print(f"❌ Error processing {book_path}: {e}")
-            return False
+            return None
     
     def scan_collection(self, collection_name):
-        """Scan all books in a collection"""
+        """
+        Scan all books in a collection
+        
+        Returns:
+            List of (book_json_path, collection_name, book_name) tasks,
+            or None if the collection is missing
+        """
         collection_path = Path(collection_name)
         
         if not collection_path.exists():
             print(f"⚠️  Collection not found: {collection_name}")
-            return
-        
-        print(f"📚 Processing {collection_name}...")
+            return None
         
-        # Get all book folders
-        book_folders = [f for f in collection_path.iterdir() 
-                       if f.is_dir() and f.name.lower() != "pdfs"]
-        
-        processed_count = 0
+        # Get all book folders (DirEntry caches the file type, so no extra stat)
+        with os.scandir(collection_path) as it:
+            book_folders = [f for f in it
+                            if f.is_dir() and f.name.lower() != "pdfs"]
         
+        tasks = []
         for book_folder in book_folders:
-            book_json_path = book_folder / "book.json"
+            book_json_path = Path(book_folder.path) / "book.json"
             if book_json_path.exists():
-                if self.process_book_file(book_json_path, collection_name, book_folder.name):
-                    processed_count += 1
-                    print(f"  ✓ {book_folder.name}")
+                tasks.append((book_json_path, collection_name, book_folder.name))
+        
+        return tasks
+    
+    def process_collections(self):
+        """Process the books of all collections concurrently"""
+        scanned = []
+        for collection in self.collections:
+            tasks = self.scan_collection(collection)
+            if tasks is not None:
+                scanned.append((collection, tasks))
         
-        print(f"  📊 {collection_name}: {processed_count} books processed")
+        # Books are independent and disk-bound, so overlap their reads and
+        # writes; every collection's books are submitted before any result
+        # is collected
+        with ThreadPoolExecutor(max_workers=BOOK_WORKERS) as executor:
+            pending = [
+                (collection, executor.map(lambda task: self.process_book_file(*task), tasks))
+                for collection, tasks in scanned
+            ]
+            results = [(collection, list(records)) for collection, records in pending]
+        
+        # Report per collection in scan order
+        for collection, records in results:
+            print(f"📚 Processing {collection}...")
+            
+            processed_count = 0
+            for record in records:
+                if record is not None:
+                    # Track the file for reference
+                    self.processed_files.append(record)
+                    processed_count += 1
+                    print(f"  ✓ {record['book']}")
+            
+            print(f"  📊 {collection}: {processed_count} books processed")
     
     def create_reference_file(self):
         """Create a reference file mapping output files to original locations"""
@@ -162,8 +208,7 @@ class BookTranslationExtractor:
         print(f"📁 Created output folder: {self.output_folder}")
         
         # Process all collections
-        for collection in self.collections:
-            self.scan_collection(collection)
+        self.process_collections()
         
         # Create reference file
         self.create_reference_file()
@@ -6,9 +6,15 @@ Combines both volumes into a single Jātakapāḷi folder
 
 import sys
 import os
+import hashlib
+import pickle
+import traceback
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 # Import the Jātaka extractor class
+import extract_jataka_correct
+import pdf_page_text
 from extract_jataka_correct import JatakaExtractor
 
 # Fix Windows console encoding
@@ -19,6 +25,116 @@ if sys.platform == 'win32':
         pass
 
 
+def _book_config(volume_info):
+    """Book config shared by every volume of the combined Jātakapāḷi folder"""
+    return {
+        'name': 'Jātakapāḷi',
+        'pali_title': 'Jātakapāḷi',
+        'english_title': '',
+        'sinhala_title': '',
+        'id_prefix': volume_info['id_prefix'],
+        # Each volume saves its own extracted text file
+        'name_override': volume_info['name'],
+    }
+
+
+# Bump when the layout of the cached (lines, nipātas) pickle changes
+CACHE_VERSION = 1
+
+# Modules whose code decides what gets cached; editing either one
+# invalidates every cached volume
+CACHE_SOURCE_MODULES = (extract_jataka_correct, pdf_page_text)
+
+
+def _extractor_hash():
+    """Hash the source of the modules that produce the cached extraction"""
+    digest = hashlib.sha1()
+    for module in CACHE_SOURCE_MODULES:
+        with open(module.__file__, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def _pdf_stamp(pdf_path):
+    """
+    Identify a PDF's current contents by modification time and size,
+    together with the cache version and the extractor code that read it
+    """
+    return (f"{CACHE_VERSION}:{_extractor_hash()}:"
+            f"{os.path.getmtime(pdf_path)}:{os.path.getsize(pdf_path)}")
+
+
+def _load_cached_volume(volume_info, output_dir, stamp):
+    """
+    Return the cached (lines, nipātas) of a volume if they were extracted
+    from the PDF with this stamp, otherwise None
+    """
+    stamp_path = os.path.join(output_dir, f".{volume_info['name']}.stamp")
+    cache_path = os.path.join(output_dir, f".{volume_info['name']}.pickle")
+    try:
+        with open(stamp_path, 'r', encoding='utf-8') as f:
+            if f.read() != stamp:
+                return None
+        with open(cache_path, 'rb') as f:
+            return pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError):
+        return None
+
+
+def _save_cached_volume(volume_info, output_dir, stamp, lines, nipatas):
+    """Cache a volume's (lines, nipātas), writing the stamp last"""
+    stamp_path = os.path.join(output_dir, f".{volume_info['name']}.stamp")
+    cache_path = os.path.join(output_dir, f".{volume_info['name']}.pickle")
+    
+    # Write to temp files and swap them in so an interrupted run never
+    # leaves a stamp pointing at a partial cache
+    with open(cache_path + '.tmp', 'wb') as f:
+        pickle.dump((lines, nipatas), f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(cache_path + '.tmp', cache_path)
+    with open(stamp_path + '.tmp', 'w', encoding='utf-8') as f:
+        f.write(stamp)
+    os.replace(stamp_path + '.tmp', stamp_path)
+
+
+def _extract_volume(volume_info, base_pdf_dir, output_dir, use_cache=True):
+    """
+    Extract, clean, save and detect the structure of one volume (runs in a
+    worker process)
+    
+    Volumes whose PDF and extractor code are unchanged since the last run
+    (same modification time, size and source hash) are loaded from the
+    cache instead of being re-extracted.
+    
+    Returns:
+        Tuple of (status, volume name, cleaned lines, nipātas, error) where
+        status is 'ok', 'fail' or 'skip'
+    """
+    pdf_path = os.path.join(base_pdf_dir, volume_info['pdf_filename'])
+    
+    # Check if PDF exists
+    if not os.path.exists(pdf_path):
+        return 'skip', volume_info['name'], None, None, f"PDF not found at {pdf_path}"
+    
+    try:
+        stamp = _pdf_stamp(pdf_path)
+        if use_cache:
+            cached = _load_cached_volume(volume_info, output_dir, stamp)
+            if cached is not None:
+                print(f"\n♻️  {volume_info['name']}: PDF unchanged, using cached extraction")
+                lines, nipatas = cached
+                return 'ok', volume_info['name'], lines, nipatas, None
+        
+        # Create extractor and run steps 1-4
+        extractor = JatakaExtractor(pdf_path, output_dir, _book_config(volume_info))
+        nipatas = extractor.extract_structure()
+        
+        _save_cached_volume(volume_info, output_dir, stamp, extractor.lines, nipatas)
+        
+        return 'ok', volume_info['name'], extractor.lines, nipatas, None
+    except Exception as e:
+        return 'fail', volume_info['name'], None, None, f"{e}\n{traceback.format_exc()}"
+
+
 def main():
     """Extract both Jātakapāḷi PDFs into a combined folder"""
     
@@ -55,85 +171,61 @@ def main():
     # Create output directory
     os.makedirs(output_dir, exist_ok=True)
     
+    # Re-extract every volume even if its PDF is unchanged
+    # (python extract_jataka_batch.py --force)
+    use_cache = '--force' not in sys.argv
+    
     successful = 0
     failed = 0
     skipped = 0
     all_vaggas = []
     
-    for i, volume_info in enumerate(volumes, 1):
+    # Text extraction and structure detection are independent per volume,
+    # so run them in parallel processes; nipāta IDs continue from the
+    # previous volume, so the JSON files are written in volume order below
+    max_workers = min(len(volumes), os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(_extract_volume, volume_info, base_pdf_dir, output_dir, use_cache)
+            for volume_info in volumes
+        ]
+        results = [future.result() for future in futures]
+    
+    for i, (volume_info, result) in enumerate(zip(volumes, results), 1):
         print("\n" + "=" * 80)
         print(f"[{i}/{len(volumes)}] {volume_info['name']}")
         print("=" * 80)
         
-        pdf_path = os.path.join(base_pdf_dir, volume_info['pdf_filename'])
-        
-        # Check if PDF exists
-        if not os.path.exists(pdf_path):
-            print(f"⚠️  Skipping: PDF not found at {pdf_path}")
+        status, name, lines, nipatas, error = result
+        if status == 'skip':
+            print(f"⚠️  Skipping: {error}")
             skipped += 1
             continue
+        if status == 'fail':
+            print(f"\n❌ Error processing {name}: {error}")
+            failed += 1
+            continue
         
-        # Create book config
-        book_config = {
-            'name': 'Jātakapāḷi',
-            'pali_title': 'Jātakapāḷi',
-            'english_title': '',
-            'sinhala_title': '',
-            'id_prefix': volume_info['id_prefix'],
-        }
+        pdf_path = os.path.join(base_pdf_dir, volume_info['pdf_filename'])
         
         try:
-            # Create extractor and process
-            extractor = JatakaExtractor(pdf_path, output_dir, book_config)
-            
-            # Extract text
-            print(f"\n[1/6] Extracting text from PDF...")
-            extractor.full_text = extractor.extract_text_from_pdf()
-            
-            print(f"\n[2/6] Cleaning text...")
-            extractor.full_text = extractor.clean_text(extractor.full_text)
-            
-            print(f"\n[3/6] Saving full extracted text...")
-            # Save with volume-specific name
-            filename = f"{volume_info['name']}_pali_extracted.txt"
-            output_path = os.path.join(output_dir, filename)
-            with open(output_path, 'w', encoding='utf-8') as f:
-                f.write(extractor.full_text)
-            print(f"✓ Saved full text to: {output_path}")
-            
-            print(f"\n[4/6] Detecting structure (Nipāta > Vagga)...")
-            nipatas = extractor.detect_structure(extractor.full_text)
+            extractor = JatakaExtractor(pdf_path, output_dir, _book_config(volume_info))
+            extractor.lines = lines
             
             # Adjust nipāta IDs to continue from previous volume
             if all_vaggas:
                 last_id = all_vaggas[-1]['id']
-                last_num = int(last_id.split('.')[1])
-                for nipata in nipatas:
-                    old_num = int(nipata['id'].split('.')[1])
-                    new_num = last_num + old_num
-                    nipata['id'] = f"{volume_info['id_prefix']}.{new_num}"
-                    print(f"  ✓ Adjusted ID: {nipata['nipata_title']} -> {nipata['id']}")
+                extractor.offset_nipata_ids(nipatas, int(last_id.split('.')[1]))
             
             all_vaggas.extend(nipatas)
             
-            print(f"\n[5/6] Finding nipāta boundaries...")
-            boundaries = extractor.find_nipata_boundaries(extractor.full_text, nipatas)
-            
-            print(f"\n[6/6] Creating nipāta JSON files...")
-            lines = extractor.full_text.split('\n')
-            
-            for start_line, end_line, nipata_info in boundaries:
-                nipata_lines = lines[start_line:end_line]
-                nipata_text = '\n'.join(nipata_lines)
-                
-                nipata_json = extractor.create_nipata_json(nipata_info, nipata_text)
-                extractor.save_nipata_json(nipata_info, nipata_json)
+            # Steps 5-6: write the nipāta JSON files
+            extractor.write_nipatas(nipatas)
             
             successful += 1
             
         except Exception as e:
             print(f"\n❌ Error processing {volume_info['name']}: {str(e)}")
-            import traceback
             traceback.print_exc()
             failed += 1
     
@@ -143,30 +235,9 @@ def main():
         print("Creating combined book.json...")
         print("=" * 80)
         
-        book_json = {
-            "name": "Jātakapāḷi",
-            "title": {
-                "pali": "Jātakapāḷi",
-                "english": "",
-                "sinhala": ""
-            },
-            "chapters": [
-                {
-                    "id": nipata['id'],
-                    "title": {
-                        "pali": nipata['nipata_title'],
-                        "english": "",
-                        "sinhala": ""
-                    }
-                }
-                for nipata in all_vaggas
-            ]
-        }
-        
-        import json
-        output_path = os.path.join(output_dir, "book.json")
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(book_json, f, ensure_ascii=False, indent=2)
+        # Every volume shares the same book config, so the last extractor
+        # writes the metadata for all volumes
+        extractor.create_book_json(all_vaggas)
         
         print(f"✓ Saved combined book metadata: book.json ({len(all_vaggas)} vaggas)")
     
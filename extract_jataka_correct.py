@@ -5,12 +5,20 @@ Jātakapāḷi has a unique 3-level structure: Nipāta > Vagga > Jātaka
 """
 
 import sys
-import fitz  # PyMuPDF
 import json
 import re
 import os
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Tuple
 
+try:
+    import orjson  # Optional: much faster JSON encoding
+except ImportError:
+    orjson = None
+
+from pdf_page_text import extract_pages_parallel
+
 # Fix Windows console encoding
 if sys.platform == 'win32':
     try:
@@ -18,6 +26,49 @@ if sys.platform == 'win32':
     except:
         pass
 
+# Write buffer for extracted text and JSON output files
+IO_BUFFER_SIZE = 1 << 20
+
+def write_text(output_path: str, text: str):
+    """Write text as UTF-8, encoded once and emitted in a single write"""
+    with open(output_path, 'wb', buffering=IO_BUFFER_SIZE) as f:
+        f.write(text.encode('utf-8'))
+
+def write_json(output_path: str, data: Dict):
+    """Write data as indented UTF-8 JSON, using orjson when it is installed"""
+    if orjson is not None:
+        with open(output_path, 'wb', buffering=IO_BUFFER_SIZE) as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+    else:
+        with open(output_path, 'w', encoding='utf-8', buffering=IO_BUFFER_SIZE) as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+
+# Nipāta title: "1. Ekakanipāto" or "17. Cattālīsanipāto"
+NIPATA_PATTERN = re.compile(r'^(\d+)\.\s+(.+nipāto)$', re.IGNORECASE)
+
+# Vagga title: "1. Apaṇṇakavaggo"
+VAGGA_PATTERN = re.compile(r'^(\d+)\.\s+(.+vaggo)$', re.IGNORECASE)
+
+# Any numbered line, used to find where a nipāta's content starts
+NUMBERED_LINE_PATTERN = re.compile(r'^\d+\.')
+
+# Jātaka title with an optional parenthesised suffix:
+# early volumes "1. Apaṇṇakajātakaṃ" or "151. Rājovādajātakaṃ (2-1-1)",
+# later volumes "521. Tesakuṇajātakaṃ (1)"
+JATAKA_PATTERN = re.compile(
+    r'^(?P<number>\d+)\.\s+(?P<title>.+jātakaṃ)(?:\s*\((?P<suffix>[^)]+)\))?$',
+    re.IGNORECASE
+)
+
+# Numbered section (the actual verse/content)
+SECTION_PATTERN = re.compile(r'^(\d+)\.\s*(.*)$')
+
+# Lines holding only a page number
+PAGE_NUMBER_PATTERN = re.compile(r'^\s*\d+\s*$')
+
+# Worker threads used to build and write nipāta JSON files
+NIPATA_WRITE_WORKERS = 4
+
 class JatakaExtractor:
     """Extract Pali text from Jātakapāḷi PDFs and create vagga JSON files"""
     
@@ -26,73 +77,68 @@ class JatakaExtractor:
         self.output_dir = output_dir
         self.book_config = book_config
         self.full_text = ""
+        self.lines: List[str] = []
         
         self.remove_patterns = [
             r'Page \d+ sur \d+',
             r'www\.tipitaka\.org',
             r'Vipassana.*Research Institute',
         ]
+        # All remove patterns fused into one alternation so each line is scanned once
+        self.remove_union = re.compile(
+            '|'.join(f'(?:{pattern})' for pattern in self.remove_patterns),
+            re.IGNORECASE
+        )
         
         os.makedirs(output_dir, exist_ok=True)
     
     def extract_text_from_pdf(self) -> str:
         """Extract text from PDF"""
         print(f"Opening PDF: {self.pdf_path}")
-        doc = fitz.open(self.pdf_path)
-        
-        all_text = []
-        for page_num in range(len(doc)):
-            page = doc[page_num]
-            text = page.get_text("text")
-            if text.strip():
-                all_text.append(text)
-            
-            if (page_num + 1) % 10 == 0:
-                print(f"  Processed {page_num + 1}/{len(doc)} pages...")
+        pages = extract_pages_parallel(self.pdf_path)
+        all_text = [text for text in pages if text.strip()]
         
-        print(f"✓ Extracted text from {len(doc)} pages")
-        doc.close()
+        print(f"✓ Extracted text from {len(pages)} pages")
         return '\n'.join(all_text)
     
     def clean_text(self, text: str) -> str:
         """Clean extracted text"""
         print("Cleaning text...")
-        lines = text.split('\n')
         cleaned_lines = []
+        append = cleaned_lines.append
+        remove = self.remove_union.sub
         
-        for line in lines:
-            line = line.strip()
-            if not line:
-                continue
-            
-            for pattern in self.remove_patterns:
-                line = re.sub(pattern, '', line, flags=re.IGNORECASE).strip()
+        for line in text.split('\n'):
+            line = remove('', line).strip()
             
-            if not line or re.match(r'^\s*\d+\s*$', line):
+            if not line or PAGE_NUMBER_PATTERN.match(line):
                 continue
             
-            cleaned_lines.append(line)
+            append(line)
         
+        # Keep the line list so later steps never re-split the full text
+        self.lines = cleaned_lines
         cleaned_text = '\n'.join(cleaned_lines)
         print(f"✓ Cleaned text: {len(cleaned_lines)} lines")
         return cleaned_text
     
     def save_full_text(self, text: str):
-        """Save the full extracted text"""
-        filename = f"{self.book_config['name']}_pali_extracted.txt"
+        """Save the full extracted text (named after name_override when set)"""
+        name = self.book_config.get('name_override', self.book_config['name'])
+        filename = f"{name}_pali_extracted.txt"
         output_path = os.path.join(self.output_dir, filename)
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(text)
+        write_text(output_path, text)
         print(f"✓ Saved full text to: {output_path}")
     
-    def detect_structure(self, text: str) -> List[Dict]:
+    def detect_structure(self) -> List[Dict]:
         """
-        Detect nipātas as chapters, with vaggas as subsections
+        Detect nipātas as chapters, with vaggas as subsections, in the
+        cleaned lines
         Returns a list of nipātas with their vaggas
         """
         print("\nDetecting structure from PDF...")
         
-        lines = text.split('\n')
+        lines = self.lines
         nipatas = []
         current_nipata = None
         
@@ -100,7 +146,7 @@ class JatakaExtractor:
             line_stripped = line.strip()
             
             # Detect Nipāta: "1. Ekakanipāto" or "17. Cattālīsanipāto"
-            nipata_match = re.match(r'^(\d+)\.\s+(.+nipāto)$', line_stripped, re.IGNORECASE)
+            nipata_match = NIPATA_PATTERN.match(line_stripped)
             if nipata_match:
                 nipata_num = int(nipata_match.group(1))
                 nipata_title = nipata_match.group(2)
@@ -120,7 +166,7 @@ class JatakaExtractor:
                 continue
             
             # Detect Vagga: "1. Apaṇṇakavaggo" (only for early nipatas)
-            vagga_match = re.match(r'^(\d+)\.\s+(.+vaggo)$', line_stripped, re.IGNORECASE)
+            vagga_match = VAGGA_PATTERN.match(line_stripped)
             if vagga_match and current_nipata and not current_nipata['is_nipata_chapter']:
                 vagga_num = int(vagga_match.group(1))
                 vagga_title = vagga_match.group(2)
@@ -135,11 +181,11 @@ class JatakaExtractor:
         print(f"\n✓ Detected {len(nipatas)} nipātas")
         return nipatas
     
-    def find_nipata_boundaries(self, text: str, nipatas: List[Dict]) -> List[Tuple[int, int, Dict]]:
-        """Find the start and end positions of each nipāta"""
+    def find_nipata_boundaries(self, nipatas: List[Dict]) -> List[Tuple[int, int, Dict]]:
+        """Find the start and end positions of each nipāta in the cleaned lines"""
         print("\nFinding nipāta boundaries...")
         
-        lines = text.split('\n')
+        lines = self.lines
         boundaries = []
         
         for i, nipata_info in enumerate(nipatas):
@@ -156,93 +202,95 @@ class JatakaExtractor:
         
         return boundaries
     
-    def extract_jatakas_from_nipata(self, nipata_text: str, nipata_info: Dict, is_nipata_chapter: bool = False) -> List[Dict]:
+    def extract_jatakas_from_nipata(self, nipata_lines: List[str], nipata_info: Dict, is_nipata_chapter: bool = False) -> List[Dict]:
         """
         Extract individual Jātaka stories from a nipāta
         Handles vaggas within the nipāta and adds vaggaTitle to first section of each vagga
         """
-        lines = nipata_text.split('\n')
+        lines = nipata_lines
         sections = []
         current_jataka_title = None
         current_jataka_number = None
         current_section = None
+        # One line buffer reused for every section (joined, then cleared)
         current_lines = []
         current_vagga_title = None
-        vaggas = nipata_info.get('vaggas', [])
-        vagga_line_nums = {v['line_num']: v['vagga_title'] for v in vaggas}
         
-        # Skip header lines
+        # Skip header lines. "Namo tassa...", "Khuddakanikāye", "Jātakapāḷi"
+        # and blank lines are never numbered, so a single numbered-line check
+        # rejects them; only "(... bhāgo)" markers need their own test
         start_idx = 0
         for idx, line in enumerate(lines):
             line_stripped = line.strip()
-            if not line_stripped or line_stripped.startswith('Namo') or line_stripped == 'Khuddakanikāye':
+            if not NUMBERED_LINE_PATTERN.match(line_stripped) or line_stripped.endswith('bhāgo)'):
                 continue
-            if line_stripped == 'Jātakapāḷi' or line_stripped.endswith('bhāgo)'):
-                continue
-            # Skip nipāta title
-            if re.match(r'^\d+\.\s+.+nipāto$', line_stripped, re.IGNORECASE):
-                start_idx = idx + 1
-                break
-            # If we find a numbered item, start from there
-            if re.match(r'^\d+\.', line_stripped):
-                start_idx = idx
-                break
-        
-        for i in range(start_idx, len(lines)):
-            line_stripped = lines[i].strip()
+            # Skip nipāta title; otherwise start from the first numbered item
+            start_idx = idx + 1 if NIPATA_PATTERN.match(line_stripped) else idx
+            break
+        
+        # Bind hot lookups to locals; the section line buffer is reused, so
+        # its append method stays valid for the whole loop
+        match_vagga = VAGGA_PATTERN.match
+        match_jataka = JATAKA_PATTERN.match
+        match_section = SECTION_PATTERN.match
+        append_section = sections.append
+        append_line = current_lines.append
+        clear_lines = current_lines.clear
+        
+        for line in islice(lines, start_idx, None):
+            line_stripped = line.strip()
             
             if not line_stripped:
                 continue
             
-            # Check if this line is a vagga title
-            vagga_match = re.match(r'^(\d+)\.\s+(.+vaggo)$', line_stripped, re.IGNORECASE)
-            if vagga_match and not is_nipata_chapter:
-                current_vagga_title = vagga_match.group(2)
-                continue
-            
-            # For later volumes: "521. Tesakuṇajātakaṃ (1)"
-            if is_nipata_chapter:
-                jataka_with_num_match = re.match(r'^(\d+)\.\s+(.+jātakaṃ)\s*\((\d+)\)$', line_stripped, re.IGNORECASE)
-                if jataka_with_num_match:
-                    # Save previous section before starting new jātaka
-                    if current_section is not None:
-                        current_section['pali'] = ' '.join(current_lines)
-                        sections.append(current_section)
-                        current_section = None
-                        current_lines = []
-                    
-                    current_jataka_number = int(jataka_with_num_match.group(1))
-                    current_jataka_title = jataka_with_num_match.group(2)
+            # Check if this line is a vagga title (later volumes have none)
+            if not is_nipata_chapter:
+                vagga_match = match_vagga(line_stripped)
+                if vagga_match:
+                    current_vagga_title = vagga_match.group(2)
                     continue
             
-            # For early volumes: "1. Apaṇṇakajātakaṃ" or "151. Rājovādajātakaṃ (2-1-1)"
-            jataka_title_match = re.match(r'^(\d+)\.\s+(.+jātakaṃ(?:\s*\([^)]+\))?)$', line_stripped, re.IGNORECASE)
-            if jataka_title_match and not is_nipata_chapter:
-                # Save previous section before starting new one
+            # One match covers both title styles; later volumes only count
+            # titles with a numeric suffix: "521. Tesakuṇajātakaṃ (1)"
+            jataka_match = match_jataka(line_stripped)
+            if jataka_match and is_nipata_chapter:
+                suffix = jataka_match.group('suffix')
+                if suffix is None or not suffix.isdecimal():
+                    jataka_match = None
+            
+            if jataka_match:
+                # Save previous section before starting new jātaka
                 if current_section is not None:
                     current_section['pali'] = ' '.join(current_lines)
-                    sections.append(current_section)
+                    append_section(current_section)
                     current_section = None
-                    current_lines = []
+                    clear_lines()
                 
-                jataka_num = jataka_title_match.group(1)
-                jataka_name = jataka_title_match.group(2)
-                # Keep the full title with number: "151. Rājovādajātakaṃ (2-1-1)"
-                current_jataka_title = f"{jataka_num}. {jataka_name}"
+                if is_nipata_chapter:
+                    current_jataka_number = int(jataka_match.group('number'))
+                    current_jataka_title = jataka_match.group('title')
+                else:
+                    # For early volumes keep the full title with number and
+                    # suffix: "151. Rājovādajātakaṃ (2-1-1)"
+                    jataka_name = line_stripped[jataka_match.start('title'):]
+                    current_jataka_title = f"{jataka_match.group('number')}. {jataka_name}"
                 continue
             
             # Check for numbered section (the actual verse/content)
             # Only create sections if we have a jataka title OR we're already processing sections
-            section_match = re.match(r'^(\d+)\.\s*(.*)$', line_stripped)
+            section_match = match_section(line_stripped)
             if section_match and (current_jataka_title or current_section is not None):
                 # Save previous section
                 if current_section is not None:
                     current_section['pali'] = ' '.join(current_lines)
-                    sections.append(current_section)
+                    append_section(current_section)
                 
                 section_number = int(section_match.group(1))
                 rest_of_line = section_match.group(2)
                 
+                # The empty translation fields stay in the literal: they fix
+                # the key order of the committed chapter files, and "" is a
+                # shared constant, so they cost no allocation
                 current_section = {
                     "number": section_number,
                     "pali": "",
@@ -255,7 +303,7 @@ class JatakaExtractor:
                     current_section["paliTitle"] = current_jataka_title
                 
                 # Add nipataTitle only to the first section
-                if len(sections) == 0:
+                if not sections:
                     current_section["nipataTitle"] = nipata_info['nipata_title']
                 
                 # Add vaggaTitle to first section of each vagga
@@ -264,17 +312,16 @@ class JatakaExtractor:
                     current_vagga_title = None  # Reset after using
                 
                 # Include the rest of the line if present
+                clear_lines()
                 if rest_of_line:
-                    current_lines = [rest_of_line]
-                else:
-                    current_lines = []
+                    append_line(rest_of_line)
                 
                 # Reset title after using it (for both early and later volumes)
                 current_jataka_title = None
             else:
                 # Regular content line
                 if current_section is not None:
-                    current_lines.append(line_stripped)
+                    append_line(line_stripped)
         
         # Save the last section
         if current_section is not None:
@@ -283,11 +330,11 @@ class JatakaExtractor:
         
         return sections
     
-    def create_nipata_json(self, nipata_info: Dict, nipata_text: str) -> Dict:
+    def create_nipata_json(self, nipata_info: Dict, nipata_lines: List[str]) -> Dict:
         """Create a JSON structure for a nipāta chapter"""
         is_nipata_chapter = nipata_info.get('is_nipata_chapter', False)
         sections = self.extract_jatakas_from_nipata(
-            nipata_text, 
+            nipata_lines,
             nipata_info,
             is_nipata_chapter
         )
@@ -316,8 +363,7 @@ class JatakaExtractor:
         
         os.makedirs(os.path.dirname(output_path), exist_ok=True)
         
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(nipata_json, f, ensure_ascii=False, indent=2)
+        write_json(output_path, nipata_json)
         
         print(f"  ✓ Saved: {filename} ({len(nipata_json['sections'])} jātakas)")
     
@@ -344,17 +390,15 @@ class JatakaExtractor:
         }
         
         output_path = os.path.join(self.output_dir, "book.json")
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(book_json, f, ensure_ascii=False, indent=2)
+        write_json(output_path, book_json)
         
         print(f"\n✓ Saved book metadata: book.json")
     
-    def process(self):
-        """Main processing method"""
-        print("=" * 70)
-        print(f"{self.book_config['name']} PDF Extraction")
-        print("=" * 70)
-        
+    def extract_structure(self) -> List[Dict]:
+        """
+        Extract, clean and save the PDF text, then detect its nipātas
+        (steps 1-4 of process)
+        """
         print("\n[1/6] Extracting text from PDF...")
         self.full_text = self.extract_text_from_pdf()
         
@@ -365,20 +409,59 @@ class JatakaExtractor:
         self.save_full_text(self.full_text)
         
         print("\n[4/6] Detecting structure (Nipāta > Vagga)...")
-        nipatas = self.detect_structure(self.full_text)
-        
+        return self.detect_structure()
+    
+    def offset_nipata_ids(self, nipatas: List[Dict], id_offset: int):
+        """Shift nipāta IDs so they continue from a previous volume"""
+        for nipata in nipatas:
+            old_num = int(nipata['id'].split('.')[1])
+            new_num = id_offset + old_num
+            nipata['id'] = f"{self.book_config['id_prefix']}.{new_num}"
+            print(f"  ✓ Adjusted ID: {nipata['nipata_title']} -> {nipata['id']}")
+    
+    def write_nipatas(self, nipatas: List[Dict]):
+        """Create the nipāta JSON files from the cleaned lines (steps 5-6 of process)"""
         print("\n[5/6] Finding nipāta boundaries...")
-        boundaries = self.find_nipata_boundaries(self.full_text, nipatas)
+        boundaries = self.find_nipata_boundaries(nipatas)
         
         print("\n[6/6] Creating nipāta JSON files...")
-        lines = self.full_text.split('\n')
         
-        for start_line, end_line, nipata_info in boundaries:
-            nipata_lines = lines[start_line:end_line]
-            nipata_text = '\n'.join(nipata_lines)
-            
-            nipata_json = self.create_nipata_json(nipata_info, nipata_text)
-            self.save_nipata_json(nipata_info, nipata_json)
+        # Nipātas are independent, so build and write them on a thread pool;
+        # file writes and orjson encoding release the GIL
+        with ThreadPoolExecutor(max_workers=NIPATA_WRITE_WORKERS) as executor:
+            futures = [
+                executor.submit(self._write_nipata, nipata_info, start_line, end_line)
+                for start_line, end_line, nipata_info in boundaries
+            ]
+            for future in futures:
+                future.result()
+    
+    def _write_nipata(self, nipata_info: Dict, start_line: int, end_line: int):
+        """Build and save the JSON file of the nipāta spanning [start_line, end_line)"""
+        nipata_json = self.create_nipata_json(nipata_info, self.lines[start_line:end_line])
+        self.save_nipata_json(nipata_info, nipata_json)
+    
+    def process(self, id_offset: int = 0) -> List[Dict]:
+        """
+        Main processing method
+        
+        Args:
+            id_offset: Number of nipātas in earlier volumes; IDs continue
+                from there when set
+        
+        Returns:
+            The nipātas written, with their final IDs
+        """
+        print("=" * 70)
+        print(f"{self.book_config['name']} PDF Extraction")
+        print("=" * 70)
+        
+        nipatas = self.extract_structure()
+        
+        if id_offset:
+            self.offset_nipata_ids(nipatas, id_offset)
+        
+        self.write_nipatas(nipatas)
         
         self.create_book_json(nipatas)
         
@@ -388,7 +471,8 @@ class JatakaExtractor:
         print(f"\nOutput directory: {self.output_dir}")
         print(f"Vagga JSONs: {os.path.join(self.output_dir, 'chapters')}")
         print(f"Book metadata: {os.path.join(self.output_dir, 'book.json')}")
-
+        
+        return nipatas
 
 def main():
     """Main entry point - for testing single file"""
@@ -9,7 +9,14 @@ import fitz  # PyMuPDF
 import json
 import re
 import os
-from typing import List, Dict, Tuple
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import List, Dict, Tuple, Optional
+
+try:
+    import orjson  # Optional: much faster JSON encoding
+except ImportError:
+    orjson = None
 
 # Fix Windows console encoding
 if sys.platform == 'win32':
@@ -18,6 +25,72 @@ if sys.platform == 'win32':
     except:
         pass
 
+# Write buffer for extracted text and JSON output files
+IO_BUFFER_SIZE = 1 << 16
+
+def write_text(output_path: str, text: str):
+    """Write text as UTF-8 through a large buffer in a single write"""
+    with open(output_path, 'w', encoding='utf-8', buffering=IO_BUFFER_SIZE) as f:
+        f.write(text)
+
+def write_json(output_path: str, data: Dict):
+    """Write data as indented UTF-8 JSON, using orjson when it is installed"""
+    if orjson is not None:
+        with open(output_path, 'wb', buffering=IO_BUFFER_SIZE) as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+    else:
+        write_text(output_path, json.dumps(data, ensure_ascii=False, indent=2))
+
+# Vagga title: "1. Yamakavaggo"
+VAGGO_PATTERN = re.compile(r'^(\d+)\.\s+(.+vaggo)$', re.IGNORECASE)
+
+# Endings of numbered chapter titles (compared in lower case):
+# "1. Yamakavaggo", "1. Uragavaggo" style nipātas, and "1. Upakāravatthu"
+# (Vimānavatthu, Petavatthu)
+CHAPTER_TITLE_ENDINGS = ('vaggo', 'nipāta', 'vatthu')
+
+# First letters of named chapter titles, only used by books with
+# 'use_generic_chapters'
+CAPITAL_LETTERS = frozenset('ABCDEFGHIJKLMNOPQRSTUVWXYZĀĪŪṄÑṬḌṆḶṂ')
+
+# Vaggo without number: "Pārāyanavaggo", "Paṭhamavaggo" (Cūḷaniddesa style)
+UNNUMBERED_VAGGO_PATTERN = re.compile(r'^([A-ZĀĪŪṄÑṬḌṆḶṂ][a-zāīūṅñṭḍṇḷṃ]+vaggo)$', re.IGNORECASE)
+
+# Any numbered line, used to find where a chapter's content starts
+NUMBERED_LINE_PATTERN = re.compile(r'^\d+\.')
+
+# Section title with range: "51-60. Suttadasakaṃ"
+TITLE_RANGE_PATTERN = re.compile(r'^(\d+)-(\d+)\.\s+(.+suttaṃ|.+suttapañcakaṃ|.+suttadasakaṃ)$', re.IGNORECASE)
+
+# Section title: "1. Akitticariyā", "2. Tissametteyyamāṇavapucchā"
+TITLE_PATTERN = re.compile(r'^(\d+)\.\s+([A-ZĀĪŪṄÑṬḌṆḶṂ][a-zāīūṅñṭḍṇḷṃ]+(?:suttaṃ|cariyā|kaṇḍaṃ|niddeso|vaggo|kathā|pucchā|gāthā))$', re.IGNORECASE)
+
+# Standalone title without number: "Vatthugāthā"
+STANDALONE_TITLE_PATTERN = re.compile(r'^([A-ZĀĪŪṄÑṬḌṆḶṂ][a-zāīūṅñṭḍṇḷṃ]+(?:gāthā|niddeso|kathā|pucchā))$', re.IGNORECASE)
+
+def _parse_numbered_section(line: str) -> Optional[Tuple[int, Optional[int], str]]:
+    """
+    Split a numbered section/verse line into (number, range end, rest of line)
+    
+    "12. Text" gives (12, None, "Text") and "51-60. Text" gives (51, 60, "Text");
+    any other line gives None. Plain string checks replace the regex, since
+    most content lines are ruled out by the first '.' alone.
+    """
+    number, dot, rest = line.partition('.')
+    if not dot:
+        return None
+    if number.isdecimal():
+        return int(number), None, rest.lstrip()
+    start, dash, end = number.partition('-')
+    if dash and start.isdecimal() and end.isdecimal():
+        return int(start), int(end), rest.lstrip()
+    return None
+
+def _create_chapter_json(args: Tuple[Dict, List[str]]) -> Dict:
+    """Build one chapter's JSON (runs in a worker process)"""
+    chapter_info, chapter_lines = args
+    return KhuddakaExtractor.create_chapter_json(chapter_info, chapter_lines)
+
 class KhuddakaExtractor:
     """Extract Pali text from Khuddaka Nikāya PDFs and create chapter JSON files"""
     
@@ -25,127 +98,166 @@ class KhuddakaExtractor:
         self.pdf_path = pdf_path
         self.output_dir = output_dir
         self.book_config = book_config
-        self.full_text = ""
+        self.lines: List[str] = []
+        self.chapter_titles: List[Tuple[int, Tuple[Optional[int], str]]] = []
         
+        # Fixed metadata strings, removed with plain str.replace (the PDFs
+        # always print them in this case)
+        self.remove_literals = [
+            'www.tipitaka.org',
+        ]
         self.remove_patterns = [
             r'Page \d+ sur \d+',
-            r'www\.tipitaka\.org',
             r'Vipassana.*Research Institute',
         ]
+        # All remove patterns fused into one alternation so each line is scanned once
+        self.remove_union = re.compile(
+            '|'.join(f'(?:{pattern})' for pattern in self.remove_patterns),
+            re.IGNORECASE
+        )
         
         os.makedirs(output_dir, exist_ok=True)
     
-    def extract_text_from_pdf(self) -> str:
-        """Extract text from PDF"""
+    def extract_text_from_pdf(self) -> List[str]:
+        """Extract the raw text lines of all PDF pages"""
         print(f"Opening PDF: {self.pdf_path}")
         doc = fitz.open(self.pdf_path)
+        page_count = len(doc)
         
-        all_text = []
-        for page_num in range(len(doc)):
-            page = doc[page_num]
-            text = page.get_text("text")
-            if text.strip():
-                all_text.append(text)
+        all_lines = []
+        extend = all_lines.extend
+        for page_num, page in enumerate(doc.pages()):
+            # Blank pages only add whitespace lines, which clean_text drops
+            extend(page.get_text("text").split('\n'))
             
             if (page_num + 1) % 10 == 0:
-                print(f"  Processed {page_num + 1}/{len(doc)} pages...")
+                print(f"  Processed {page_num + 1}/{page_count} pages...")
         
-        print(f"✓ Extracted text from {len(doc)} pages")
+        print(f"✓ Extracted text from {page_count} pages")
         doc.close()
-        return '\n'.join(all_text)
+        return all_lines
     
-    def clean_text(self, text: str) -> str:
-        """Clean extracted text"""
+    def clean_text(self, lines: List[str]) -> List[str]:
+        """
+        Clean extracted text lines
+        
+        Chapter titles are matched in the same pass and recorded in
+        self.chapter_titles, so detect_chapters need not rescan the text
+        """
         print("Cleaning text...")
-        lines = text.split('\n')
         cleaned_lines = []
+        chapter_titles = []
+        append = cleaned_lines.append
+        remove = self.remove_union.sub
+        remove_literals = self.remove_literals
+        match_title = self.match_chapter_title
         
         for line in lines:
             line = line.strip()
             if not line:
                 continue
             
-            for pattern in self.remove_patterns:
-                line = re.sub(pattern, '', line, flags=re.IGNORECASE).strip()
+            for literal in remove_literals:
+                line = line.replace(literal, '')
+            line = remove('', line).strip()
             
-            if not line or re.match(r'^\s*\d+\s*$', line):
+            # The line is stripped, so a page number line is all digits
+            if not line or line.isdecimal():
                 continue
             
-            cleaned_lines.append(line)
+            title = match_title(line)
+            if title is not None:
+                chapter_titles.append((len(cleaned_lines), title))
+            
+            append(line)
         
-        cleaned_text = '\n'.join(cleaned_lines)
+        # Keep the line list so later steps never re-split the full text
+        self.lines = cleaned_lines
+        self.chapter_titles = chapter_titles
         print(f"✓ Cleaned text: {len(cleaned_lines)} lines")
-        return cleaned_text
+        return cleaned_lines
     
-    def save_full_text(self, text: str):
+    def save_full_text(self, lines: List[str]):
         """Save the full extracted text"""
         filename = f"{self.book_config['name']}_pali_extracted.txt"
         output_path = os.path.join(self.output_dir, filename)
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(text)
+        write_text(output_path, '\n'.join(lines))
         print(f"✓ Saved full text to: {output_path}")
     
-    def detect_chapters(self, text: str) -> List[Dict]:
+    def match_chapter_title(self, line: str) -> Optional[Tuple[Optional[int], str]]:
+        """
+        Return (number, title) if a stripped line is a chapter title, else None
+        The number is None for vaggas without one
+        """
+        if not line[:1].isdecimal():
+            # Only an unnumbered "...vaggo" can be a title without a number
+            if line[-5:].lower() != 'vaggo':
+                return None
+            match = UNNUMBERED_VAGGO_PATTERN.match(line)
+            return (None, match.group(1)) if match else None
+        
+        # Peel off the "N. " prefix
+        number, dot, rest = line.partition('.')
+        if not dot or not number.isdecimal() or not rest[:1].isspace():
+            return None
+        title = rest.lstrip()
+        
+        lowered = title.lower()
+        if lowered.endswith(CHAPTER_TITLE_ENDINGS):
+            if lowered not in CHAPTER_TITLE_ENDINGS:
+                return int(number), title
+            # A title that is only the ending takes one of the separating
+            # spaces as its first character, if there is one to spare. This
+            # keeps the old VAGGO_PATTERN-style r'\s+(.+vaggo)' result, where
+            # backtracking hands ".+" the last space: "1.  vaggo" gives
+            # " vaggo", and "1. vaggo" is not a title at all
+            if len(rest) - len(title) > 1:
+                return int(number), rest[-len(title) - 1:]
+        
+        # Named sections are only chapters in texts without clear
+        # vaggo/nipāta markers
+        if len(title) > 1 and title[0] in CAPITAL_LETTERS and \
+           self.book_config.get('use_generic_chapters', False):
+            return int(number), title
+        return None
+    
+    def detect_chapters(self, lines: List[str],
+                        chapter_titles: Optional[List[Tuple[int, Tuple[Optional[int], str]]]] = None) -> List[Dict]:
         """
         Detect chapters from the text
         Khuddaka uses various structures:
         - Vaggas like "1. Yamakavaggo"
         - Nipātas like "1. Uragavaggo"
         - Sometimes just numbered sections
+        
+        chapter_titles are the (line_num, (number, title)) pairs recorded by
+        clean_text; the lines are scanned for them when not given
         """
         print("\nDetecting chapters from PDF...")
         
-        lines = text.split('\n')
-        chapters = []
+        if chapter_titles is None:
+            chapter_titles = []
+            for i, line in enumerate(lines):
+                title = self.match_chapter_title(line.strip())
+                if title is not None:
+                    chapter_titles.append((i, title))
         
-        for i, line in enumerate(lines):
-            line_stripped = line.strip()
+        chapters = []
+        for i, (chapter_num, chapter_title) in chapter_titles:
+            if chapter_num is None:
+                # Vaggo without number - use sequential numbering
+                chapter_num = len(chapters) + 1
             
-            # Pattern 1: Vaggo with number - "1. Yamakavaggo"
-            match1 = re.match(r'^(\d+)\.\s+(.+vaggo)$', line_stripped, re.IGNORECASE)
-            # Pattern 2: Nipāta - "1. Uragavaggo" (Sutta Nipāta style)
-            match2 = re.match(r'^(\d+)\.\s+(.+nipāta)$', line_stripped, re.IGNORECASE)
-            # Pattern 3: Vatthu - "1. Upakāravatthu" (for Vimānavatthu, Petavatthu)
-            match3 = re.match(r'^(\d+)\.\s+(.+vatthu)$', line_stripped, re.IGNORECASE)
-            # Pattern 4: Vaggo without number - "Pārāyanavaggo", "Paṭhamavaggo" (Cūḷaniddesa style)
-            match4 = re.match(r'^([A-ZĀĪŪṄÑṬḌṆḶṂ][a-zāīūṅñṭḍṇḷṃ]+vaggo)$', line_stripped, re.IGNORECASE)
-            # Pattern 5: Named sections - look for titles with specific keywords
-            match5 = re.match(r'^(\d+)\.\s+([A-ZĀĪŪṄÑṬḌṆḶṂ].+)$', line_stripped)
+            # Generate ID
+            chapter_id = f"{self.book_config['id_prefix']}.{len(chapters) + 1}"
             
-            match = match1 or match2 or match3 or match4
-            if match:
-                if match4:
-                    # Vaggo without number - use sequential numbering
-                    chapter_num = len(chapters) + 1
-                    chapter_title = match.group(1)
-                else:
-                    chapter_num = int(match.group(1))
-                    chapter_title = match.group(2)
-                
-                # Generate ID
-                chapter_id = f"{self.book_config['id_prefix']}.{len(chapters) + 1}"
-                
-                chapters.append({
-                    'id': chapter_id,
-                    'number': chapter_num,
-                    'title': chapter_title,
-                    'line_num': i
-                })
-                print(f"  ✓ Found chapter {chapter_num}: {chapter_title} ({chapter_id})")
-            elif match4 and self.book_config.get('use_generic_chapters', False):
-                # For texts without clear vaggo/nipāta markers
-                chapter_num = int(match4.group(1))
-                chapter_title = match4.group(2)
-                
-                chapter_id = f"{self.book_config['id_prefix']}.{len(chapters) + 1}"
-                
-                chapters.append({
-                    'id': chapter_id,
-                    'number': chapter_num,
-                    'title': chapter_title,
-                    'line_num': i
-                })
-                print(f"  ✓ Found chapter {chapter_num}: {chapter_title} ({chapter_id})")
+            chapters.append({
+                'id': chapter_id,
+                'number': chapter_num,
+                'title': chapter_title,
+                'line_num': i
+            })
+            print(f"  ✓ Found chapter {chapter_num}: {chapter_title} ({chapter_id})")
         
         # If no chapters detected, treat entire text as one chapter
         if not chapters:
@@ -160,11 +272,10 @@ class KhuddakaExtractor:
         print(f"\n✓ Detected {len(chapters)} chapters")
         return chapters
     
-    def find_chapter_boundaries(self, text: str, chapters: List[Dict]) -> List[Tuple[int, int, Dict]]:
+    def find_chapter_boundaries(self, lines: List[str], chapters: List[Dict]) -> List[Tuple[int, int, Dict]]:
         """Find the start and end positions of each chapter"""
         print("\nFinding chapter boundaries...")
         
-        lines = text.split('\n')
         boundaries = []
         
         for i, chapter_info in enumerate(chapters):
@@ -181,7 +292,8 @@ class KhuddakaExtractor:
         
         return boundaries
     
-    def extract_sections_from_chapter(self, chapter_text: str, chapter_title: str) -> List[Dict]:
+    @staticmethod
+    def extract_sections_from_chapter(lines: List[str], chapter_title: str) -> List[Dict]:
         """
         Extract numbered sections from a chapter
         Handles various formats:
@@ -190,49 +302,56 @@ class KhuddakaExtractor:
         - Sutta-like structures
         Section numbers reset within each vagga
         """
-        lines = chapter_text.split('\n')
         sections = []
         current_section = None
         current_lines = []
         current_title = None
         current_vagga = chapter_title  # Default vagga is the chapter title
         
+        # Strip every line and drop the empty ones once, up front
+        lines = [line for line in map(str.strip, lines) if line]
+        
         # Skip header lines (Namo, Khuddakanikāye, book title, chapter title)
         start_idx = 0
         for idx, line in enumerate(lines):
-            line_stripped = line.strip()
-            # Skip empty lines and common headers
-            if not line_stripped or line_stripped.startswith('Namo') or line_stripped == 'Khuddakanikāye':
+            # Skip common headers
+            if line.startswith('Namo') or line == 'Khuddakanikāye':
                 continue
             # If we find the chapter title, start after it
-            if line_stripped == chapter_title:
+            if line == chapter_title:
                 start_idx = idx + 1
                 break
             # If we find a numbered item or section title, start from there
-            if re.match(r'^\d+\.', line_stripped):
+            if NUMBERED_LINE_PATTERN.match(line):
                 start_idx = idx
                 break
         
-        for i in range(start_idx, len(lines)):
-            line_stripped = lines[i].strip()
-            
-            if not line_stripped:
-                continue
-            
+        # Bind hot lookups to locals; the section line buffer is reused, so
+        # its append method stays valid for the whole loop
+        match_vagga = VAGGO_PATTERN.match
+        match_title_range = TITLE_RANGE_PATTERN.match
+        match_title = TITLE_PATTERN.match
+        match_standalone_title = STANDALONE_TITLE_PATTERN.match
+        parse_section = _parse_numbered_section
+        append_section = sections.append
+        append_line = current_lines.append
+        clear_lines = current_lines.clear
+        
+        for line_stripped in islice(lines, start_idx, None):
             # Check for vagga markers (sub-chapters within a chapter)
             # Pattern: "1. Yamakavaggo" or "2. Appamādavaggo"
-            vagga_match = re.match(r'^(\d+)\.\s+(.+vaggo)$', line_stripped, re.IGNORECASE)
+            vagga_match = match_vagga(line_stripped)
             if vagga_match:
                 current_vagga = vagga_match.group(2)
                 continue
             
             # Check for sutta/section title with range: "51-60. Suttadasakaṃ"
-            title_range_match = re.match(r'^(\d+)-(\d+)\.\s+(.+suttaṃ|.+suttapañcakaṃ|.+suttadasakaṃ)$', line_stripped, re.IGNORECASE)
+            title_range_match = match_title_range(line_stripped)
             # Check for sutta/section title (optional) - broader pattern to catch more titles
             # Matches patterns like "1. Akitticariyā", "2. Tissametteyyamāṇavapucchā", etc.
-            title_match = re.match(r'^(\d+)\.\s+([A-ZĀĪŪṄÑṬḌṆḶṂ][a-zāīūṅñṭḍṇḷṃ]+(?:suttaṃ|cariyā|kaṇḍaṃ|niddeso|vaggo|kathā|pucchā|gāthā))$', line_stripped, re.IGNORECASE)
+            title_match = match_title(line_stripped)
             # Check for standalone title without number (like "Vatthugāthā")
-            standalone_title_match = re.match(r'^([A-ZĀĪŪṄÑṬḌṆḶṂ][a-zāīūṅñṭḍṇḷṃ]+(?:gāthā|niddeso|kathā|pucchā))$', line_stripped, re.IGNORECASE)
+            standalone_title_match = match_standalone_title(line_stripped)
             
             if title_range_match:
                 current_title = title_range_match.group(3)
@@ -244,21 +363,17 @@ class KhuddakaExtractor:
                 current_title = standalone_title_match.group(1)
                 continue
             
-            # Check for numbered section/verse with range
-            section_range_match = re.match(r'^(\d+)-(\d+)\.\s*(.*)$', line_stripped)
-            # Check for numbered section/verse
-            section_match = re.match(r'^(\d+)\.\s*(.*)$', line_stripped)
+            # Check for numbered section/verse, with or without a number range
+            numbered = parse_section(line_stripped)
             
-            if section_range_match:
+            if numbered is not None and numbered[1] is not None:
                 # Save previous section
                 if current_section is not None:
                     current_section['pali'] = ' '.join(current_lines)
-                    sections.append(current_section)
+                    append_section(current_section)
                 
-                start_num = int(section_range_match.group(1))
-                end_num = int(section_range_match.group(2))
+                start_num, end_num, rest_of_line = numbered
                 number_range = f"{start_num}-{end_num}"
-                rest_of_line = section_range_match.group(3)
                 
                 current_section = {
                     "number": start_num,
@@ -274,20 +389,18 @@ class KhuddakaExtractor:
                     current_section["vagga"] = current_vagga
                 
                 # Include the rest of the line if present
+                clear_lines()
                 if rest_of_line:
-                    current_lines = [rest_of_line]
-                else:
-                    current_lines = []
+                    append_line(rest_of_line)
                     
                 current_title = None  # Reset after using
-            elif section_match:
+            elif numbered is not None:
                 # Save previous section
                 if current_section is not None:
                     current_section['pali'] = ' '.join(current_lines)
-                    sections.append(current_section)
+                    append_section(current_section)
                 
-                section_number = int(section_match.group(1))
-                rest_of_line = section_match.group(2)
+                section_number, _, rest_of_line = numbered
                 
                 current_section = {
                     "number": section_number,
@@ -302,16 +415,15 @@ class KhuddakaExtractor:
                     current_section["vagga"] = current_vagga
                 
                 # Include the rest of the line if present
+                clear_lines()
                 if rest_of_line:
-                    current_lines = [rest_of_line]
-                else:
-                    current_lines = []
+                    append_line(rest_of_line)
                     
                 current_title = None  # Reset after using
             else:
                 # Regular content line
                 if current_section is not None:
-                    current_lines.append(line_stripped)
+                    append_line(line_stripped)
                 elif not sections:
                     # First section without number - create section 1
                     current_section = {
@@ -324,7 +436,7 @@ class KhuddakaExtractor:
                     # Only add vagga if it's different from chapter title
                     if current_vagga != chapter_title:
                         current_section["vagga"] = current_vagga
-                    current_lines = [line_stripped]
+                    append_line(line_stripped)
         
         # Save the last section
         if current_section is not None:
@@ -333,9 +445,10 @@ class KhuddakaExtractor:
         
         return sections
     
-    def create_chapter_json(self, chapter_info: Dict, chapter_text: str) -> Dict:
+    @staticmethod
+    def create_chapter_json(chapter_info: Dict, chapter_lines: List[str]) -> Dict:
         """Create a JSON structure for a chapter"""
-        sections = self.extract_sections_from_chapter(chapter_text, chapter_info['title'])
+        sections = KhuddakaExtractor.extract_sections_from_chapter(chapter_lines, chapter_info['title'])
         
         chapter_json = {
             "id": chapter_info['id'],
@@ -361,8 +474,7 @@ class KhuddakaExtractor:
         
         os.makedirs(os.path.dirname(output_path), exist_ok=True)
         
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(chapter_json, f, ensure_ascii=False, indent=2)
+        write_json(output_path, chapter_json)
         
         print(f"  ✓ Saved: {filename} ({len(chapter_json['sections'])} sections)")
     
@@ -389,8 +501,7 @@ class KhuddakaExtractor:
         }
         
         output_path = os.path.join(self.output_dir, "book.json")
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(book_json, f, ensure_ascii=False, indent=2)
+        write_json(output_path, book_json)
         
         print(f"\n✓ Saved book metadata: book.json")
     
@@ -401,29 +512,42 @@ class KhuddakaExtractor:
         print("=" * 70)
         
         print("\n[1/6] Extracting text from PDF...")
-        self.full_text = self.extract_text_from_pdf()
+        raw_lines = self.extract_text_from_pdf()
         
         print("\n[2/6] Cleaning text...")
-        self.full_text = self.clean_text(self.full_text)
+        self.clean_text(raw_lines)
+        
+        # The cleaned lines in self.lines are the only copy of the text kept
+        # from here on, so release the raw page lines
+        del raw_lines
+        lines = self.lines
         
         print("\n[3/6] Saving full extracted text...")
-        self.save_full_text(self.full_text)
+        self.save_full_text(lines)
         
         print("\n[4/6] Detecting chapters...")
-        chapters = self.detect_chapters(self.full_text)
+        chapters = self.detect_chapters(lines, self.chapter_titles)
         
         print("\n[5/6] Finding chapter boundaries...")
-        boundaries = self.find_chapter_boundaries(self.full_text, chapters)
+        boundaries = self.find_chapter_boundaries(lines, chapters)
         
         print("\n[6/6] Creating chapter JSON files...")
-        lines = self.full_text.split('\n')
-        
-        for start_line, end_line, chapter_info in boundaries:
-            chapter_lines = lines[start_line:end_line]
-            chapter_text = '\n'.join(chapter_lines)
-            
-            chapter_json = self.create_chapter_json(chapter_info, chapter_text)
-            self.save_chapter_json(chapter_info, chapter_json)
+        # Chapters are independent, so parse them in worker processes; the
+        # files are saved here in chapter order
+        workers = min(os.cpu_count() or 1, len(boundaries))
+        if workers > 1:
+            work = [(chapter_info, lines[start_line:end_line])
+                    for start_line, end_line, chapter_info in boundaries]
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                chapter_jsons = executor.map(_create_chapter_json, work)
+                for (chapter_info, _), chapter_json in zip(work, chapter_jsons):
+                    self.save_chapter_json(chapter_info, chapter_json)
+        else:
+            # Slice each chapter only when it is processed, so at most one
+            # chapter's line list exists at a time
+            for start_line, end_line, chapter_info in boundaries:
+                chapter_json = self.create_chapter_json(chapter_info, lines[start_line:end_line])
+                self.save_chapter_json(chapter_info, chapter_json)
         
         self.create_book_json(chapters)
         
@@ -5,12 +5,20 @@ Extracts Pali text from PDF and creates structured JSON files for each chapter
 
 import sys
 import fitz  # PyMuPDF
+import functools
 import json
 import re
 import os
+from bisect import bisect_right
+from itertools import islice
 from pathlib import Path
 from typing import List, Dict, Tuple, Optional
 
+try:
+    import orjson  # Optional: much faster JSON encoding
+except ImportError:
+    orjson = None
+
 # Fix Windows console encoding
 if sys.platform == 'win32':
     try:
@@ -18,6 +26,64 @@ if sys.platform == 'win32':
     except:
         pass
 
+# Write buffer for extracted text and JSON output files
+IO_BUFFER_SIZE = 1 << 16
+
+def write_text(output_path: str, text: str):
+    """Write text as UTF-8 through a large buffer in a single write"""
+    with open(output_path, 'w', encoding='utf-8', buffering=IO_BUFFER_SIZE) as f:
+        f.write(text)
+
+def write_json(output_path: str, data: Dict):
+    """Write data as indented UTF-8 JSON, using orjson when it is installed"""
+    if orjson is not None:
+        with open(output_path, 'wb', buffering=IO_BUFFER_SIZE) as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+    else:
+        write_text(output_path, json.dumps(data, ensure_ascii=False, indent=2))
+
+# Chapter title line: "1. Mahāpadānasuttaṃ"
+CHAPTER_HEADER_PATTERN = re.compile(r'^\d+\.\s+\w+suttaṃ')
+
+# Numbered section start: "1. ", "2. ", etc.
+SECTION_PATTERN = re.compile(r'^(\d+)\.\s+(.+)')
+
+# Common section title endings, plus words that mark a title anywhere
+SECTION_TITLE_PATTERN = re.compile(
+    r'(?:vatthu|kathā|vaṇṇanā|dhammā|dhammatā|lakkhaṇā|lakkhaṇaṃ|vagga)$'
+    r'|paṭisaṃyutta|nidāna',
+    re.IGNORECASE
+)
+
+def _parse_numbered_section(line: str) -> Optional[Tuple[int, str]]:
+    """
+    Split a stripped "12. Text" section line into (12, "Text"), or return None
+    
+    Same result as SECTION_PATTERN, using plain string checks so most content
+    lines are ruled out by the first '.' alone
+    """
+    number, dot, rest = line.partition('.')
+    if not dot or not number.isdecimal() or not rest[:1].isspace():
+        return None
+    rest = rest.lstrip()
+    if not rest:
+        return None
+    return int(number), rest
+
+def _has_numbered_heading(line: str, title: str) -> bool:
+    """
+    Check whether the title appears in the line right after a number, as in
+    "1. Mahāpadānasuttaṃ" (same test as searching for r'\d+\.\s+' + title)
+    """
+    start = line.find(title)
+    while start != -1:
+        # The title must follow "<digits>." and at least one whitespace
+        prefix = line[:start].rstrip()
+        if len(prefix) < start and prefix.endswith('.') and prefix[-2:-1].isdecimal():
+            return True
+        start = line.find(title, start + 1)
+    return False
+
 class MahavaggaPaliExtractor:
     """Extract Pali text from Mahāvaggapāḷi PDF and create chapter JSON files"""
     
@@ -31,15 +97,23 @@ class MahavaggaPaliExtractor:
         """
         self.pdf_path = pdf_path
         self.output_dir = output_dir
-        self.full_text = ""
+        self.lines: List[str] = []
         
         # Patterns to remove (metadata)
+        # Fixed metadata strings, removed with plain str.replace (the PDFs
+        # always print them in this case)
+        self.remove_literals = [
+            'www.tipitaka.org',  # Website URL
+        ]
         self.remove_patterns = [
             r'Page \d+ sur \d+',  # Page numbers like "Page 1 sur 144"
-            r'www\.tipitaka\.org',  # Website URL
             r'Vipassana.*Research Institute',  # Organization (with any content between)
-            r'^\s*\d+\s*$',  # Lines with only numbers
         ]
+        # All remove patterns fused into one alternation so each line is scanned once
+        self.remove_union = re.compile(
+            '|'.join(f'(?:{pattern})' for pattern in self.remove_patterns),
+            re.IGNORECASE
+        )
         
         # Chapter information for Mahāvaggapāḷi
         self.chapters = [
@@ -51,50 +125,52 @@ class MahavaggaPaliExtractor:
         # Create output directory if it doesn't exist
         os.makedirs(output_dir, exist_ok=True)
     
-    def extract_text_from_pdf(self) -> str:
+    def extract_text_from_pdf(self) -> List[str]:
         """
         Extract text from PDF with proper character handling to avoid spaces in words
         
         Returns:
-            Extracted text as a string
+            Raw text lines of all pages
         """
         print(f"Opening PDF: {self.pdf_path}")
         doc = fitz.open(self.pdf_path)
+        page_count = len(doc)
         
-        all_text = []
+        all_lines = []
+        extend = all_lines.extend
         
-        for page_num in range(len(doc)):
-            page = doc[page_num]
-            
+        for page_num, page in enumerate(doc.pages()):
             # Extract text with layout preservation
             # Using "text" mode which is better for continuous text
             text = page.get_text("text")
             
-            if text.strip():
-                all_text.append(text)
+            # Blank pages only add whitespace lines, which clean_text drops
+            extend(text.split('\n'))
             
             if (page_num + 1) % 10 == 0:
-                print(f"  Processed {page_num + 1}/{len(doc)} pages...")
+                print(f"  Processed {page_num + 1}/{page_count} pages...")
         
-        print(f"✓ Extracted text from {len(doc)} pages")
+        print(f"✓ Extracted text from {page_count} pages")
         doc.close()
         
-        return '\n'.join(all_text)
+        return all_lines
     
-    def clean_text(self, text: str) -> str:
+    def clean_text(self, lines: List[str]) -> List[str]:
         """
         Clean extracted text by removing metadata and normalizing
         
         Args:
-            text: Raw extracted text
+            lines: Raw extracted text lines
             
         Returns:
-            Cleaned text
+            Cleaned lines
         """
         print("Cleaning text...")
         
-        lines = text.split('\n')
         cleaned_lines = []
+        append = cleaned_lines.append
+        remove = self.remove_union.sub
+        remove_literals = self.remove_literals
         
         for line in lines:
             # Remove leading/trailing whitespace
@@ -105,84 +181,91 @@ class MahavaggaPaliExtractor:
                 continue
             
             # Remove metadata patterns from within the line
-            for pattern in self.remove_patterns:
-                line = re.sub(pattern, '', line, flags=re.IGNORECASE).strip()
+            for literal in remove_literals:
+                line = line.replace(literal, '')
+            line = remove('', line).strip()
             
             # Check if line should be completely removed (now empty or still contains metadata)
             should_remove = False
-            if not line:  # Line became empty after cleaning
+            if not line or line.isdecimal():  # Empty after cleaning, or only a number
                 should_remove = True
             
             if not should_remove:
-                cleaned_lines.append(line)
+                append(line)
         
-        # Join with single newline (no need for \n characters in output)
-        cleaned_text = '\n'.join(cleaned_lines)
+        # Keep the line list so later steps never re-split the full text
+        self.lines = cleaned_lines
         
         print(f"✓ Cleaned text: {len(cleaned_lines)} lines")
-        return cleaned_text
+        return cleaned_lines
     
-    def save_full_text(self, text: str, filename: str = "Mahāvaggapāḷi_pali_extracted.txt"):
+    def save_full_text(self, lines: List[str], filename: str = "Mahāvaggapāḷi_pali_extracted.txt"):
         """
         Save the full extracted text to a file
         
         Args:
-            text: The text to save
+            lines: The cleaned lines to save
             filename: Output filename
         """
         output_path = os.path.join(self.output_dir, filename)
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(text)
+        # Join with single newline (no need for \n characters in output)
+        write_text(output_path, '\n'.join(lines))
         print(f"✓ Saved full text to: {output_path}")
     
-    def find_chapter_boundaries(self, text: str) -> List[Tuple[int, int, Dict]]:
+    def find_chapter_boundaries(self, lines: List[str]) -> List[Tuple[int, int, Dict]]:
         """
         Find the start and end positions of each chapter in the text
         
         Args:
-            text: The full cleaned text
+            lines: The full cleaned text lines
             
         Returns:
             List of tuples: (start_pos, end_pos, chapter_info)
         """
         print("\nFinding chapter boundaries...")
         
-        lines = text.split('\n')
         boundaries = []
+        titles = [chapter_info['title'] for chapter_info in self.chapters]
+        
+        # Collect the heading lines of every chapter in a single pass; a
+        # substring test rules out lines that don't mention the title at all
+        heading_lines = [[] for _ in titles]
+        for line_num, line in enumerate(lines):
+            for i, title in enumerate(titles):
+                if title not in line:
+                    continue
+                # Look for pattern like "1. Mahāpadānasuttaṃ" or just "Mahāpadānasuttaṃ"
+                stripped = line.strip()
+                if (stripped == title and len(stripped) < 100) or \
+                   _has_numbered_heading(line, title):
+                    heading_lines[i].append(line_num)
         
         for i, chapter_info in enumerate(self.chapters):
             chapter_title = chapter_info['title']
             
-            # Find chapter start
-            start_line = None
-            for line_num, line in enumerate(lines):
-                # Look for pattern like "1. Mahāpadānasuttaṃ" or just "Mahāpadānasuttaṃ"
-                if re.search(r'\d+\.\s+' + re.escape(chapter_title), line) or \
-                   (line.strip() == chapter_title and len(line.strip()) < 100):
-                    start_line = line_num
-                    print(f"  ✓ Found chapter {chapter_info['number']}: {chapter_title} at line {line_num}")
-                    break
-            
-            if start_line is None:
+            # Chapter starts at its first heading line
+            if not heading_lines[i]:
                 print(f"  ✗ Warning: Could not find chapter: {chapter_title}")
                 continue
+            start_line = heading_lines[i][0]
+            print(f"  ✓ Found chapter {chapter_info['number']}: {chapter_title} at line {start_line}")
             
-            # Find chapter end (start of next chapter or end of file)
+            # Find chapter end (next chapter's first heading after the start,
+            # or end of file)
             end_line = len(lines)
             if i + 1 < len(self.chapters):
-                next_chapter_title = self.chapters[i + 1]['title']
-                for line_num in range(start_line + 1, len(lines)):
-                    line = lines[line_num]
-                    if re.search(r'\d+\.\s+' + re.escape(next_chapter_title), line) or \
-                       (line.strip() == next_chapter_title and len(line.strip()) < 100):
-                        end_line = line_num
-                        break
+                next_lines = heading_lines[i + 1]
+                next_index = bisect_right(next_lines, start_line)
+                if next_index < len(next_lines):
+                    end_line = next_lines[next_index]
             
             boundaries.append((start_line, end_line, chapter_info))
         
         return boundaries
     
-    def detect_section_title(self, line: str) -> Optional[str]:
+    @staticmethod
+    @functools.lru_cache(maxsize=4096)
+    def detect_section_title(line: str) -> Optional[str]:
         """
         Detect if a line is a section title (paliTitle)
         
@@ -192,6 +275,8 @@ class MahavaggaPaliExtractor:
         - Are capitalized or follow specific patterns
         - Do NOT start with quotes or contain long sentences
         
+        Verdicts are cached, since refrains and short titles repeat.
+        
         Args:
             line: The line to check
             
@@ -209,73 +294,62 @@ class MahavaggaPaliExtractor:
             return None
         
         # Check for common section title endings
-        title_patterns = [
-            r'vatthu$',
-            r'kathā$',
-            r'vaṇṇanā$',
-            r'dhammā$',
-            r'dhammatā$',
-            r'lakkhaṇā$',
-            r'lakkhaṇaṃ$',
-            r'paṭisaṃyutta',
-            r'nidāna',
-            r'vagga$',
-        ]
-        
-        for pattern in title_patterns:
-            if re.search(pattern, line, re.IGNORECASE):
-                return line
+        if SECTION_TITLE_PATTERN.search(line):
+            return line
         
         return None
     
-    def extract_sections_from_chapter(self, chapter_text: str) -> List[Dict]:
+    def extract_sections_from_chapter(self, lines: List[str]) -> List[Dict]:
         """
         Extract sections from a chapter text
         
         Each section is identified by a number pattern like "1. ", "2. ", etc.
         
         Args:
-            chapter_text: The text of a single chapter
+            lines: The text lines of a single chapter
             
         Returns:
             List of section dictionaries
         """
-        lines = chapter_text.split('\n')
         sections = []
         current_section = None
         current_lines = []
         pending_pali_title = None
         
+        # Strip every line and drop the empty ones once, up front
+        lines = [line for line in map(str.strip, lines) if line]
+        
         # Skip the first line if it's the chapter title
         start_idx = 0
-        if lines and re.match(r'^\d+\.\s+\w+suttaṃ', lines[0].strip()):
+        if lines and CHAPTER_HEADER_PATTERN.match(lines[0]):
             start_idx = 1
         
-        for i in range(start_idx, len(lines)):
-            line_stripped = lines[i].strip()
-            
-            # Skip empty lines
-            if not line_stripped:
-                continue
-            
+        # Bind hot lookups to locals; the section line buffer is reused, so
+        # its append method stays valid for the whole loop
+        detect_title = self.detect_section_title
+        parse_section = _parse_numbered_section
+        append_section = sections.append
+        append_line = current_lines.append
+        clear_lines = current_lines.clear
+        
+        for line_stripped in islice(lines, start_idx, None):
             # Check if this is a section title (should come before numbered sections)
-            detected_title = self.detect_section_title(line_stripped)
+            detected_title = detect_title(line_stripped)
             if detected_title:
                 pending_pali_title = detected_title
                 continue
             
             # Check if this is a numbered section start (e.g., "1. ", "2. ", etc.)
-            section_match = re.match(r'^(\d+)\.\s+(.+)', line_stripped)
+            numbered = parse_section(line_stripped)
             
-            if section_match:
+            if numbered is not None:
                 # Save previous section if exists
                 if current_section is not None:
                     current_section['pali'] = ' '.join(current_lines)
-                    sections.append(current_section)
+                    append_section(current_section)
                 
                 # Start new section
-                section_num = int(section_match.group(1))
-                rest_of_line = section_match.group(2)
+                section_num, rest_of_line = numbered
                 
                 current_section = {
                     "number": section_num,
@@ -284,13 +358,14 @@ class MahavaggaPaliExtractor:
                     "sinhala": "",
                     "paliTitle": pending_pali_title if pending_pali_title else ""
                 }
-                current_lines = [rest_of_line]
+                clear_lines()
+                append_line(rest_of_line)
                 pending_pali_title = None  # Reset after using
             
             # Regular content line
             else:
                 if current_section is not None:
-                    current_lines.append(line_stripped)
+                    append_line(line_stripped)
         
         # Save the last section
         if current_section is not None:
@@ -299,25 +374,25 @@ class MahavaggaPaliExtractor:
         
         return sections
     
-    def create_chapter_json(self, chapter_info: Dict, chapter_text: str) -> Dict:
+    def create_chapter_json(self, chapter_info: Dict, chapter_lines: List[str]) -> Dict:
         """
         Create a JSON structure for a chapter
         
         Args:
             chapter_info: Dictionary with chapter metadata
-            chapter_text: The text content of the chapter
+            chapter_lines: The text lines of the chapter
             
         Returns:
             Dictionary in the format of chapter_template.json
         """
         # Extract sections
-        sections = self.extract_sections_from_chapter(chapter_text)
+        sections = self.extract_sections_from_chapter(chapter_lines)
         
         # Get chapter title from the first line if available
-        first_line = chapter_text.split('\n')[0].strip()
-        chapter_title_match = re.match(r'^\d+\.\s+(.+)', first_line)
+        first_line = chapter_lines[0].strip() if chapter_lines else ''
+        chapter_title_match = SECTION_PATTERN.match(first_line)
         if chapter_title_match:
-            pali_title = chapter_title_match.group(1)
+            pali_title = chapter_title_match.group(2)
         else:
             pali_title = chapter_info['title']
         
@@ -347,8 +422,7 @@ class MahavaggaPaliExtractor:
         # Create chapters directory if it doesn't exist
         os.makedirs(os.path.dirname(output_path), exist_ok=True)
         
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(chapter_json, f, ensure_ascii=False, indent=2)
+        write_json(output_path, chapter_json)
         
         print(f"  ✓ Saved: {filename} ({len(chapter_json['sections'])} sections)")
     
@@ -362,33 +436,35 @@ class MahavaggaPaliExtractor:
         
         # Step 1: Extract text from PDF
         print("\n[1/5] Extracting text from PDF...")
-        self.full_text = self.extract_text_from_pdf()
+        raw_lines = self.extract_text_from_pdf()
         
         # Step 2: Clean the text
         print("\n[2/5] Cleaning text...")
-        self.full_text = self.clean_text(self.full_text)
+        self.clean_text(raw_lines)
+        
+        # The cleaned lines in self.lines are the only copy of the text kept
+        # from here on, so release the raw page lines
+        del raw_lines
+        lines = self.lines
         
         # Step 3: Save full text
         print("\n[3/5] Saving full extracted text...")
-        self.save_full_text(self.full_text)
+        self.save_full_text(lines)
         
         # Step 4: Find chapter boundaries
         print("\n[4/5] Identifying chapters...")
-        boundaries = self.find_chapter_boundaries(self.full_text)
+        boundaries = self.find_chapter_boundaries(lines)
         
         # Step 5: Process each chapter
         print("\n[5/5] Creating chapter JSON files...")
-        lines = self.full_text.split('\n')
-        
         for start_line, end_line, chapter_info in boundaries:
             chapter_lines = lines[start_line:end_line]
-            chapter_text = '\n'.join(chapter_lines)
             
             print(f"\nProcessing {chapter_info['title']}...")
             print(f"  Lines: {start_line} to {end_line} ({len(chapter_lines)} lines)")
             
             # Create chapter JSON
-            chapter_json = self.create_chapter_json(chapter_info, chapter_text)
+            chapter_json = self.create_chapter_json(chapter_info, chapter_lines)
             
             # Save chapter JSON
             self.save_chapter_json(chapter_info, chapter_json)
@@ -5,11 +5,20 @@ Similar to Aṅguttara structure but adapted for Majjhima's organization
 """
 
 import sys
-import fitz  # PyMuPDF
 import json
+import logging
 import re
 import os
-from typing import List, Dict, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain, islice
+from typing import List, Dict, Tuple, Optional
+
+try:
+    import orjson  # Optional: much faster JSON encoding
+except ImportError:
+    orjson = None
+
+from pdf_page_text import extract_pages_parallel
 
 # Fix Windows console encoding
 if sys.platform == 'win32':
@@ -18,6 +27,43 @@ if sys.platform == 'win32':
     except:
         pass
 
+logger = logging.getLogger(__name__)
+
+
+def configure_logging():
+    """
+    Send log messages to stdout at the level named by LOGLEVEL
+
+    Per-vagga progress lines are debug messages; run with LOGLEVEL=DEBUG to
+    see them.
+    """
+    logging.basicConfig(level=os.environ.get('LOGLEVEL', 'INFO').upper(),
+                        format='%(message)s', stream=sys.stdout)
+
+def write_json(output_path: str, data: Dict):
+    """Write data as indented UTF-8 JSON, using orjson when it is installed"""
+    if orjson is not None:
+        with open(output_path, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+    else:
+        with open(output_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+
+# Vagga title: "1. Mūlapariyāyavaggo"
+VAGGO_PATTERN = re.compile(r'^(\d+)\.\s+(.+vaggo)$', re.IGNORECASE)
+
+# Sutta title with range: "51-60. Suttadasakaṃ"
+SUTTA_RANGE_PATTERN = re.compile(r'^(\d+)-(\d+)\.\s+(.+suttaṃ|.+suttapañcakaṃ|.+suttadasakaṃ)$', re.IGNORECASE)
+
+# Sutta title: "1. Mūlapariyāyasuttaṃ"
+SUTTA_PATTERN = re.compile(r'^(\d+)\.\s+(.+suttaṃ)$', re.IGNORECASE)
+
+# Section number with range: "51-60. Content..."
+SECTION_RANGE_PATTERN = re.compile(r'^(\d+)-(\d+)\.\s+(.+)')
+
+# Section number: "1. Evaṃ me sutaṃ..."
+SECTION_PATTERN = re.compile(r'^(\d+)\.\s+(.+)')
+
 class MajjhimaVaggaExtractor:
     """Extract Pali text from Majjhima Nikāya PDF and create vagga (chapter) JSON files"""
     
@@ -25,165 +71,188 @@ class MajjhimaVaggaExtractor:
         self.pdf_path = pdf_path
         self.output_dir = output_dir
         self.book_config = book_config
-        self.full_text = ""
+        self.lines: List[str] = []
+        self.vagga_titles: List[Tuple[int, int, str]] = []
         
         self.remove_patterns = [
             r'Page \d+ sur \d+',
             r'www\.tipitaka\.org',
             r'Vipassana.*Research Institute',
         ]
+        # All remove patterns fused into one alternation so each line is scanned once
+        self.remove_union = re.compile(
+            '|'.join(f'(?:{pattern})' for pattern in self.remove_patterns),
+            re.IGNORECASE
+        )
         
         os.makedirs(output_dir, exist_ok=True)
     
-    def extract_text_from_pdf(self) -> str:
-        """Extract text from PDF"""
+    def extract_text_from_pdf(self) -> List[str]:
+        """Extract the text of each PDF page"""
         print(f"Opening PDF: {self.pdf_path}")
-        doc = fitz.open(self.pdf_path)
-        
-        all_text = []
-        for page_num in range(len(doc)):
-            page = doc[page_num]
-            text = page.get_text("text")
-            if text.strip():
-                all_text.append(text)
-            
-            if (page_num + 1) % 10 == 0:
-                print(f"  Processed {page_num + 1}/{len(doc)} pages...")
+        pages = extract_pages_parallel(self.pdf_path)
         
-        print(f"✓ Extracted text from {len(doc)} pages")
-        doc.close()
-        return '\n'.join(all_text)
+        print(f"✓ Extracted text from {len(pages)} pages")
+        return pages
     
-    def clean_text(self, text: str) -> str:
-        """Clean extracted text"""
+    def clean_text(self, pages: List[str]) -> List[str]:
+        """
+        Clean extracted page texts into a list of lines
+        
+        Pages are split one at a time, so the whole text is never joined into
+        a single string. Blank pages only add whitespace lines, which are
+        dropped. Vagga titles are matched in the same pass and recorded in
+        self.vagga_titles, so detect_vaggas need not rescan the text
+        """
         print("Cleaning text...")
-        lines = text.split('\n')
+        lines = chain.from_iterable(page.split('\n') for page in pages)
         cleaned_lines = []
+        vagga_titles = []
         
-        for line in lines:
-            line = line.strip()
-            if not line:
-                continue
-            
-            for pattern in self.remove_patterns:
-                line = re.sub(pattern, '', line, flags=re.IGNORECASE).strip()
+        # Bind hot lookups to locals
+        append = cleaned_lines.append
+        remove = self.remove_union.sub
+        match_vagga = VAGGO_PATTERN.match
+        
+        # Strip every line and drop the empty ones in C, before the loop
+        for line in filter(None, map(str.strip, lines)):
+            line = remove('', line).strip()
             
-            if not line or re.match(r'^\s*\d+\s*$', line):
+            # The line is stripped, so a page number line is all digits
+            if not line or line.isdecimal():
                 continue
             
-            cleaned_lines.append(line)
+            # Pattern: number, dot, space, name ending with vaggo
+            match = match_vagga(line)
+            if match:
+                vagga_titles.append((len(cleaned_lines), int(match.group(1)), match.group(2)))
+            
+            append(line)
         
-        cleaned_text = '\n'.join(cleaned_lines)
+        # Keep the line list so later steps never re-split the full text
+        self.lines = cleaned_lines
+        self.vagga_titles = vagga_titles
         print(f"✓ Cleaned text: {len(cleaned_lines)} lines")
-        return cleaned_text
+        return cleaned_lines
     
-    def save_full_text(self, text: str):
+    def save_full_text(self, lines: List[str]):
         """Save the full extracted text"""
         filename = f"{self.book_config['name']}_pali_extracted.txt"
         output_path = os.path.join(self.output_dir, filename)
         with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(text)
+            f.write('\n'.join(lines))
         print(f"✓ Saved full text to: {output_path}")
     
-    def detect_vaggas(self, text: str) -> List[Dict]:
+    def detect_vaggas(self, lines: List[str],
+                      vagga_titles: Optional[List[Tuple[int, int, str]]] = None) -> List[Dict]:
         """
         Detect vaggas (chapters) from the text
         Majjhima vaggas are marked like: "1. Mūlapariyāyavaggo"
+        
+        vagga_titles are the (line_num, number, title) tuples recorded by
+        clean_text; the lines are scanned for them when not given
         """
         print("\nDetecting vaggas (chapters) from PDF...")
         
-        lines = text.split('\n')
-        vaggas = []
+        if vagga_titles is None:
+            vagga_titles = []
+            for i, line in enumerate(lines):
+                match = VAGGO_PATTERN.match(line.strip())
+                if match:
+                    vagga_titles.append((i, int(match.group(1)), match.group(2)))
         
-        for i, line in enumerate(lines):
-            line_stripped = line.strip()
-            # Pattern: number, dot, space, name ending with vaggo
-            match = re.match(r'^(\d+)\.\s+(.+vaggo)$', line_stripped, re.IGNORECASE)
+        vaggas = []
+        for i, vagga_num, vagga_title in vagga_titles:
+            # Generate ID
+            vagga_id = f"mn.{self.book_config['book_num']}.{len(vaggas) + 1}"
             
-            if match:
-                vagga_num = int(match.group(1))
-                vagga_title = match.group(2)
-                
-                # Generate ID
-                vagga_id = f"mn.{self.book_config['book_num']}.{len(vaggas) + 1}"
-                
-                vaggas.append({
-                    'id': vagga_id,
-                    'number': vagga_num,
-                    'title': vagga_title,
-                    'line_num': i
-                })
-                print(f"  ✓ Found vagga {vagga_num}: {vagga_title} ({vagga_id})")
+            vaggas.append({
+                'id': vagga_id,
+                'number': vagga_num,
+                'title': vagga_title,
+                'line_num': i
+            })
+            logger.debug("  ✓ Found vagga %s: %s (%s)", vagga_num, vagga_title, vagga_id)
         
         print(f"\n✓ Detected {len(vaggas)} vaggas")
         return vaggas
     
-    def find_vagga_boundaries(self, text: str, vaggas: List[Dict]) -> List[Tuple[int, int, Dict]]:
+    def find_vagga_boundaries(self, lines: List[str], vaggas: List[Dict]) -> List[Tuple[int, int, Dict]]:
         """Find the start and end positions of each vagga"""
         print("\nFinding vagga boundaries...")
         
-        lines = text.split('\n')
         boundaries = []
         
-        for i, vagga_info in enumerate(vaggas):
+        # Each vagga ends where the next one starts, the last at end of file
+        end_lines = [vagga_info['line_num'] for vagga_info in vaggas[1:]]
+        end_lines.append(len(lines))
+        
+        for vagga_info, end_line in zip(vaggas, end_lines):
             start_line = vagga_info['line_num']
-            
-            # Find end (start of next vagga or end of file)
-            if i + 1 < len(vaggas):
-                end_line = vaggas[i + 1]['line_num']
-            else:
-                end_line = len(lines)
-            
-            print(f"  ✓ {vagga_info['title']}: lines {start_line} to {end_line}")
+            logger.debug("  ✓ %s: lines %s to %s", vagga_info['title'], start_line, end_line)
             boundaries.append((start_line, end_line, vagga_info))
         
         return boundaries
     
-    def extract_suttas_from_vagga(self, vagga_text: str) -> List[Dict]:
+    def extract_suttas_from_vagga(self, lines: List[str]) -> List[Dict]:
         """
-        Extract suttas (sections) from a vagga
+        Extract suttas (sections) from a vagga's cleaned lines
         Suttas in Majjhima are marked like: "1. Mūlapariyāyasuttaṃ" or "51-60. Suttadasakaṃ"
         followed by numbered sections like "1. Evaṃ me sutaṃ..." or "51-60. Content..."
+        
+        The lines come from clean_text and are already stripped, so they are
+        used as they are
         """
-        lines = vagga_text.split('\n')
         suttas = []
         current_sutta = None
         current_lines = []
         current_sutta_title = None
         
+        # Bind hot lookups to locals
+        match_sutta_range = SUTTA_RANGE_PATTERN.match
+        match_sutta = SUTTA_PATTERN.match
+        match_section_range = SECTION_RANGE_PATTERN.match
+        match_section = SECTION_PATTERN.match
+        append_sutta = suttas.append
+        
         # Skip the first line (vagga title)
         start_idx = 1
         
-        for i in range(start_idx, len(lines)):
-            line_stripped = lines[i].strip()
-            
+        for line_stripped in islice(lines, start_idx, None):
             if not line_stripped:
                 continue
             
-            # Check for sutta title with range: "51-60. Suttadasakaṃ"
-            sutta_range_match = re.match(r'^(\d+)-(\d+)\.\s+(.+suttaṃ|.+suttapañcakaṃ|.+suttadasakaṃ)$', line_stripped, re.IGNORECASE)
-            # Check for sutta title: number, dot, space, name ending with suttaṃ
-            sutta_match = re.match(r'^(\d+)\.\s+(.+suttaṃ)$', line_stripped, re.IGNORECASE)
+            # Sutta titles and section numbers all start with a digit (\d),
+            # so any other line is content and needs no regex
+            if not line_stripped[0].isdecimal():
+                if current_sutta is not None:
+                    current_lines.append(line_stripped)
+                continue
             
+            # Check for sutta title with range: "51-60. Suttadasakaṃ"
+            sutta_range_match = match_sutta_range(line_stripped)
             if sutta_range_match:
                 # This is a sutta title with range, save it for the next section
                 current_sutta_title = sutta_range_match.group(3)
                 continue
-            elif sutta_match:
+            
+            # Check for sutta title: number, dot, space, name ending with suttaṃ
+            sutta_match = match_sutta(line_stripped)
+            if sutta_match:
                 # This is a regular sutta title, save it for the next section
                 current_sutta_title = sutta_match.group(2)
                 continue
             
             # Check for section number with range: "51-60. Content..."
-            section_range_match = re.match(r'^(\d+)-(\d+)\.\s+(.+)', line_stripped)
+            section_range_match = match_section_range(line_stripped)
             # Check for section number: number, dot, space, then content
-            section_match = re.match(r'^(\d+)\.\s+(.+)', line_stripped)
+            section_match = None if section_range_match else match_section(line_stripped)
             
             if section_range_match:
                 # Save previous sutta
                 if current_sutta is not None:
                     current_sutta['pali'] = ' '.join(current_lines)
-                    suttas.append(current_sutta)
+                    append_sutta(current_sutta)
                 
                 start_num = int(section_range_match.group(1))
                 end_num = int(section_range_match.group(2))
@@ -204,7 +273,7 @@ class MajjhimaVaggaExtractor:
                 # Save previous sutta
                 if current_sutta is not None:
                     current_sutta['pali'] = ' '.join(current_lines)
-                    suttas.append(current_sutta)
+                    append_sutta(current_sutta)
                 
                 section_number = int(section_match.group(1))
                 rest_of_line = section_match.group(2)
@@ -218,21 +287,20 @@ class MajjhimaVaggaExtractor:
                 }
                 current_lines = [rest_of_line]
                 current_sutta_title = None  # Reset after using
-            else:
+            elif current_sutta is not None:
                 # Regular content line
-                if current_sutta is not None:
-                    current_lines.append(line_stripped)
+                current_lines.append(line_stripped)
         
         # Save the last sutta
         if current_sutta is not None:
             current_sutta['pali'] = ' '.join(current_lines)
-            suttas.append(current_sutta)
+            append_sutta(current_sutta)
         
         return suttas
     
-    def create_vagga_json(self, vagga_info: Dict, vagga_text: str) -> Dict:
-        """Create a JSON structure for a vagga (chapter)"""
-        suttas = self.extract_suttas_from_vagga(vagga_text)
+    def create_vagga_json(self, vagga_info: Dict, vagga_lines: List[str]) -> Dict:
+        """Create a JSON structure for a vagga (chapter) from its cleaned lines"""
+        suttas = self.extract_suttas_from_vagga(vagga_lines)
         
         vagga_json = {
             "id": vagga_info['id'],
@@ -258,10 +326,9 @@ class MajjhimaVaggaExtractor:
         
         os.makedirs(os.path.dirname(output_path), exist_ok=True)
         
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(vagga_json, f, ensure_ascii=False, indent=2)
+        write_json(output_path, vagga_json)
         
-        print(f"  ✓ Saved: {filename} ({len(vagga_json['sections'])} suttas)")
+        logger.debug("  ✓ Saved: %s (%s suttas)", filename, len(vagga_json['sections']))
     
     def create_book_json(self, vaggas: List[Dict]):
         """Create a book.json file with metadata about all vaggas"""
@@ -286,8 +353,7 @@ class MajjhimaVaggaExtractor:
         }
         
         output_path = os.path.join(self.output_dir, "book.json")
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(book_json, f, ensure_ascii=False, indent=2)
+        write_json(output_path, book_json)
         
         print(f"\n✓ Saved book metadata: book.json")
     
@@ -298,29 +364,37 @@ class MajjhimaVaggaExtractor:
         print("=" * 70)
         
         print("\n[1/6] Extracting text from PDF...")
-        self.full_text = self.extract_text_from_pdf()
+        pages = self.extract_text_from_pdf()
         
         print("\n[2/6] Cleaning text...")
-        self.full_text = self.clean_text(self.full_text)
+        lines = self.clean_text(pages)
+        
+        # The cleaned lines are the only copy of the text kept from here on
+        del pages
         
         print("\n[3/6] Saving full extracted text...")
-        self.save_full_text(self.full_text)
+        self.save_full_text(lines)
         
         print("\n[4/6] Detecting vaggas (chapters)...")
-        vaggas = self.detect_vaggas(self.full_text)
+        vaggas = self.detect_vaggas(lines, self.vagga_titles)
         
         print("\n[5/6] Finding vagga boundaries...")
-        boundaries = self.find_vagga_boundaries(self.full_text, vaggas)
+        boundaries = self.find_vagga_boundaries(lines, vaggas)
         
         print("\n[6/6] Creating vagga (chapter) JSON files...")
-        lines = self.full_text.split('\n')
-        
-        for start_line, end_line, vagga_info in boundaries:
-            vagga_lines = lines[start_line:end_line]
-            vagga_text = '\n'.join(vagga_lines)
+        # Encode and write each vagga on a background thread while the next
+        # one is parsed; a single writer keeps the files and their progress
+        # lines in vagga order
+        with ThreadPoolExecutor(max_workers=1) as writer:
+            futures = []
+            for start_line, end_line, vagga_info in boundaries:
+                vagga_json = self.create_vagga_json(vagga_info, lines[start_line:end_line])
+                futures.append(writer.submit(self.save_vagga_json, vagga_info, vagga_json))
             
-            vagga_json = self.create_vagga_json(vagga_info, vagga_text)
-            self.save_vagga_json(vagga_info, vagga_json)
+            for future in futures:
+                future.result()
+        
+        print(f"✓ Saved {len(boundaries)} vagga JSON files")
         
         self.create_book_json(vaggas)
         
@@ -335,6 +409,8 @@ class MajjhimaVaggaExtractor:
 def main():
     """Main entry point - for testing single file"""
     
+    configure_logging()
+    
     book_config = {
         'name': 'Majjhimapaṇṇāsapāḷi',
         'pali_title': 'Majjhimapaṇṇāsapāḷi',
@@ -6,12 +6,60 @@ and creates a bulk translation JSON file.
 """
 
 import json
+import logging
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from collections import defaultdict
 
+try:
+    import orjson  # Optional: much faster JSON parsing/encoding
+except ImportError:
+    orjson = None
+
+def _parse_json(data):
+    """Parse UTF-8 JSON bytes, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data.decode('utf-8'))
+
+def _load_footer(path):
+    """
+    Load a book or chapter file (str or Path) and return only its footer field
+    
+    A file whose bytes never contain the "footer" key has no footer to
+    report, so it is not parsed at all.
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+    if b'"footer"' not in data:
+        return {}
+    return _parse_json(data).get('footer', {})
+
+def _footer_triple(footer):
+    """Return the stripped (pali, english, sinhala) texts of a footer dict"""
+    get = footer.get
+    return get('pali', '').strip(), get('english', '').strip(), get('sinhala', '').strip()
+
+def _book_context(book_path):
+    """Context string for a book.json footer"""
+    book_path = Path(book_path)
+    return f"Book Footer: {book_path.parent.name}/{book_path.name}"
+
+def _chapter_context(chapter_path):
+    """Context string for a chapter file footer"""
+    chapter_path = Path(chapter_path)
+    return f"Chapter Footer: {chapter_path.parent.parent.name}/{chapter_path.name}"
+
+logger = logging.getLogger(__name__)
+
+# Worker threads used to read and parse JSON files; the work is disk-bound
+FILE_WORKERS = 16
+
 class MissingFooterExtractor:
     def __init__(self):
-        self.missing_footers = {}  # pali -> contexts
+        self.missing_footers = {}  # pali -> set of contexts
         self.stats = {
             'books_scanned': 0,
             'chapters_scanned': 0,
@@ -32,90 +80,61 @@ class MissingFooterExtractor:
         """Check if a translation is missing or empty"""
         return not text or text.strip() == ''
     
-    def extract_from_book(self, book_path):
+    def extract_from_book(self, book_path, pending_footer=None):
         """Extract missing footer translations from a book.json file"""
+        return self._extract_footer(book_path, _book_context, pending_footer)
+    
+    def extract_from_chapter(self, chapter_path, pending_footer=None):
+        """Extract missing footer translations from a chapter JSON file (str or Path)"""
+        return self._extract_footer(chapter_path, _chapter_context, pending_footer)
+    
+    def _extract_footer(self, path, context_builder, pending_footer=None):
+        """
+        Record the footer of a book or chapter file if a translation is missing
+        
+        context_builder turns the path into the context string; pending_footer
+        is an optional future of _load_footer(path) already submitted to a
+        thread pool
+        """
         try:
-            with open(book_path, 'r', encoding='utf-8') as f:
-                book_data = json.load(f)
+            if pending_footer is not None:
+                footer = pending_footer.result()
+            else:
+                footer = _load_footer(path)
+            if not isinstance(footer, dict):
+                return True
             
-            # Check footer in book metadata
-            footer = book_data.get('footer', {})
-            if isinstance(footer, dict):
-                pali_footer = footer.get('pali', '').strip()
-                english_footer = footer.get('english', '').strip()
-                sinhala_footer = footer.get('sinhala', '').strip()
-                
-                if pali_footer:
-                    self.stats['footers_found'] += 1
-                    
-                    # Check if translations are missing
-                    missing_english = self.is_missing_translation(english_footer)
-                    missing_sinhala = self.is_missing_translation(sinhala_footer)
-                    
-                    if missing_english or missing_sinhala:
-                        context = f"Book Footer: {book_path.parent.name}/{book_path.name}"
-                        
-                        if pali_footer not in self.missing_footers:
-                            self.missing_footers[pali_footer] = {
-                                'contexts': [],
-                                'missing_english': missing_english,
-                                'missing_sinhala': missing_sinhala
-                            }
-                        
-                        self.missing_footers[pali_footer]['contexts'].append(context)
-                        
-                        if missing_english:
-                            self.stats['missing_english'] += 1
-                        if missing_sinhala:
-                            self.stats['missing_sinhala'] += 1
+            pali_footer, english_footer, sinhala_footer = _footer_triple(footer)
+            if not pali_footer:
+                return True
+            self.stats['footers_found'] += 1
             
-            return True
+            # Check if translations are missing
+            missing_english = self.is_missing_translation(english_footer)
+            missing_sinhala = self.is_missing_translation(sinhala_footer)
+            if not (missing_english or missing_sinhala):
+                return True
             
-        except Exception as e:
-            print(f"❌ Error processing {book_path}: {e}")
-            return False
-    
-    def extract_from_chapter(self, chapter_path):
-        """Extract missing footer translations from a chapter JSON file"""
-        try:
-            with open(chapter_path, 'r', encoding='utf-8') as f:
-                chapter_data = json.load(f)
+            # The same footer closes many chapters, so share one key string
+            pali_footer = sys.intern(pali_footer)
+            entry = self.missing_footers.get(pali_footer)
+            if entry is None:
+                entry = self.missing_footers[pali_footer] = {
+                    'contexts': set(),
+                    'missing_english': missing_english,
+                    'missing_sinhala': missing_sinhala
+                }
+            entry['contexts'].add(context_builder(path))
             
-            # Check footer in chapter metadata
-            footer = chapter_data.get('footer', {})
-            if isinstance(footer, dict):
-                pali_footer = footer.get('pali', '').strip()
-                english_footer = footer.get('english', '').strip()
-                sinhala_footer = footer.get('sinhala', '').strip()
-                
-                if pali_footer:
-                    self.stats['footers_found'] += 1
-                    
-                    # Check if translations are missing
-                    missing_english = self.is_missing_translation(english_footer)
-                    missing_sinhala = self.is_missing_translation(sinhala_footer)
-                    
-                    if missing_english or missing_sinhala:
-                        context = f"Chapter Footer: {chapter_path.parent.parent.name}/{chapter_path.name}"
-                        
-                        if pali_footer not in self.missing_footers:
-                            self.missing_footers[pali_footer] = {
-                                'contexts': [],
-                                'missing_english': missing_english,
-                                'missing_sinhala': missing_sinhala
-                            }
-                        
-                        self.missing_footers[pali_footer]['contexts'].append(context)
-                        
-                        if missing_english:
-                            self.stats['missing_english'] += 1
-                        if missing_sinhala:
-                            self.stats['missing_sinhala'] += 1
+            if missing_english:
+                self.stats['missing_english'] += 1
+            if missing_sinhala:
+                self.stats['missing_sinhala'] += 1
             
             return True
             
         except Exception as e:
-            print(f"❌ Error processing {chapter_path}: {e}")
+            print(f"❌ Error processing {path}: {e}")
             return False
     
     def scan_collection(self, collection_name):
@@ -128,25 +147,43 @@ class MissingFooterExtractor:
         
         print(f"📚 Scanning {collection_name}...")
         
-        # Get all book folders
-        book_folders = [f for f in collection_path.iterdir() 
-                       if f.is_dir() and f.name.lower() != "pdfs"]
+        # Get all book folders (DirEntry caches the file type, so no extra stat)
+        with os.scandir(collection_path) as it:
+            book_folders = [f for f in it
+                            if f.is_dir() and f.name.lower() != "pdfs"]
         
-        for book_folder in book_folders:
-            print(f"  ✓ {book_folder.name}")
-            
-            # Process book.json
-            book_json_path = book_folder / "book.json"
-            if book_json_path.exists():
-                self.extract_from_book(book_json_path)
-                self.stats['books_scanned'] += 1
+        with ThreadPoolExecutor(max_workers=FILE_WORKERS) as executor:
+            # Read and parse every file of the collection on the pool up
+            # front; only the footers are kept, and they are recorded below
+            # in scan order so stats match a sequential scan
+            books = []
+            for book_folder in book_folders:
+                book_json_path = Path(book_folder.path, "book.json")
+                book_footer = None
+                if book_json_path.exists():
+                    book_footer = executor.submit(_load_footer, book_json_path)
+                
+                # Chapter files are passed on as plain str paths
+                chapter_footers = []
+                chapters_folder = os.path.join(book_folder.path, "chapters")
+                if os.path.exists(chapters_folder):
+                    with os.scandir(chapters_folder) as it:
+                        chapter_footers = [(entry.path, executor.submit(_load_footer, entry.path))
+                                           for entry in it if entry.name.endswith(".json")]
+                
+                books.append((book_folder, book_json_path, book_footer, chapter_footers))
             
-            # Process chapter files
-            chapters_folder = book_folder / "chapters"
-            if chapters_folder.exists():
-                chapter_files = list(chapters_folder.glob("*.json"))
-                for chapter_file in chapter_files:
-                    self.extract_from_chapter(chapter_file)
+            for book_folder, book_json_path, book_footer, chapter_footers in books:
+                logger.debug("  ✓ %s", book_folder.name)
+                
+                # Process book.json
+                if book_footer is not None:
+                    self.extract_from_book(book_json_path, book_footer)
+                    self.stats['books_scanned'] += 1
+                
+                # Process chapter files
+                for chapter_file, chapter_footer in chapter_footers:
+                    self.extract_from_chapter(chapter_file, chapter_footer)
                     self.stats['chapters_scanned'] += 1
     
     def generate_bulk_footer_json(self, output_file="bulk_footer_translations.json"):
@@ -159,7 +196,8 @@ class MissingFooterExtractor:
                 "pali": pali_footer,
                 "english": "",
                 "sinhala": "",
-                "contexts": info['contexts'],
+                # Sorted so the file does not depend on directory listing order
+                "contexts": sorted(info['contexts']),
                 "usage_count": len(info['contexts']),
                 "originally_needed": {
                     "english": info['missing_english'],
@@ -190,8 +228,11 @@ class MissingFooterExtractor:
         
         # Write to file
         output_path = Path(output_file)
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(bulk_data, f, ensure_ascii=False, indent=2)
+        if orjson is not None:
+            output_path.write_bytes(orjson.dumps(bulk_data, option=orjson.OPT_INDENT_2))
+        else:
+            with open(output_path, 'w', encoding='utf-8') as f:
+                json.dump(bulk_data, f, ensure_ascii=False, indent=2)
         
         print(f"📁 Generated: {output_file}")
         return output_path
@@ -233,6 +274,10 @@ class MissingFooterExtractor:
 
 
 def main():
+    # Per-book progress lines are debug messages; run with LOGLEVEL=DEBUG to
+    # see them
+    logging.basicConfig(level=os.environ.get('LOGLEVEL', 'INFO').upper(),
+                        format='%(message)s', stream=sys.stdout)
     extractor = MissingFooterExtractor()
     extractor.run()
 
@@ -12,10 +12,83 @@ Organizes output to maximize Google Translate free quota efficiency.
 
 import json
 import os
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from collections import defaultdict
 import csv
 
+try:
+    import orjson  # Optional: much faster JSON parsing/encoding
+except ImportError:
+    orjson = None
+
+try:
+    import ijson  # Optional: streams chapter files without building their texts
+except ImportError:
+    ijson = None
+
+# The only chapter keys scan_chapter_content reads, at the top level and in
+# each section; the Pali/English/Sinhala texts are skipped while streaming
+CHAPTER_KEYS = frozenset(('id', 'title', 'sections'))
+SECTION_KEYS = frozenset((
+    'number', 'paliTitle', 'englishTitle', 'sinhalaTitle',
+    'vagga', 'vaggaEnglish', 'vaggaSinhala'
+))
+
+def _load_json(path):
+    """Load a JSON file, using orjson when it is installed"""
+    if orjson is not None:
+        with open(path, 'rb') as f:
+            return orjson.loads(f.read())
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def _load_chapter(path):
+    """
+    Load the parts of a chapter file that scan_chapter_content reads
+    
+    With ijson installed the file is streamed and only CHAPTER_KEYS and the
+    SECTION_KEYS of each section are built, so the section texts never
+    become Python objects; otherwise the whole file is loaded.
+    """
+    if ijson is None:
+        return _load_json(path)
+    
+    builder = ijson.ObjectBuilder()
+    skipped = None  # Prefix of the value being skipped, if any
+    with open(path, 'rb') as f:
+        for prefix, event, value in ijson.parse(f, use_float=True):
+            if skipped is not None:
+                if prefix == skipped or prefix.startswith(skipped_children):
+                    continue
+                skipped = None
+            
+            if event == 'map_key':
+                if prefix == '':
+                    wanted = CHAPTER_KEYS
+                elif prefix == 'sections.item':
+                    wanted = SECTION_KEYS
+                else:
+                    wanted = None
+                if wanted is not None and value not in wanted:
+                    skipped = f"{prefix}.{value}" if prefix else value
+                    skipped_children = skipped + '.'
+                    continue
+            
+            builder.event(event, value)
+    return builder.value
+
+def _scan_book_worker(book_folder):
+    """
+    Scan one book folder with a fresh extractor (runs in a worker process)
+    
+    Returns:
+        Tuple of (missing translations, stats, progress messages)
+    """
+    extractor = MissingTranslationExtractor()
+    messages = extractor.scan_book(book_folder)
+    return extractor.missing_translations, extractor.stats, messages
+
 class MissingTranslationExtractor:
     def __init__(self):
         self.missing_translations = {
@@ -188,8 +261,72 @@ class MissingTranslationExtractor:
                             f"Vagga Title: {context_base}"
                         )
     
-    def scan_collection(self, collection_name):
-        """Scan an entire collection for missing translations"""
+    def scan_book(self, book_folder):
+        """
+        Scan a book folder's book.json and chapter files
+        
+        Returns:
+            List of progress messages, printed by the caller in book order
+        """
+        messages = []
+        book_json_path = book_folder / "book.json"
+        
+        if not book_json_path.exists():
+            messages.append(f"  ⚠️  No book.json in {book_folder.name}")
+            return messages
+        
+        try:
+            # Scan book metadata
+            book_data = _load_json(book_json_path)
+            
+            self.scan_book_metadata(book_json_path, book_data)
+            self.stats['books_scanned'] += 1
+            
+            # Scan chapter content files
+            chapters_folder = book_folder / "chapters"
+            if chapters_folder.exists():
+                chapter_files = list(chapters_folder.glob("*.json"))
+                
+                for chapter_file in chapter_files:
+                    try:
+                        chapter_data = _load_chapter(chapter_file)
+                        
+                        self.scan_chapter_content(chapter_file, chapter_data)
+                        self.stats['chapters_scanned'] += 1
+                        
+                        # Count sections
+                        sections = chapter_data.get('sections', [])
+                        self.stats['sections_scanned'] += len(sections)
+                        
+                    except Exception as e:
+                        messages.append(f"    ❌ Error reading {chapter_file.name}: {e}")
+            
+            messages.append(f"  ✓ {book_folder.name}")
+            
+        except Exception as e:
+            messages.append(f"  ❌ Error reading {book_json_path}: {e}")
+        
+        return messages
+    
+    def merge_results(self, missing_translations, stats):
+        """Merge one book's scan results, keeping contexts unique and in order"""
+        for lang, found in missing_translations.items():
+            target = self.missing_translations[lang]
+            for pali_text, contexts in found.items():
+                known = target[pali_text]
+                known.extend(context for context in contexts if context not in known)
+        
+        for key, value in stats.items():
+            self.stats[key] += value
+    
+    def scan_collection(self, collection_name, executor=None):
+        """
+        Scan an entire collection for missing translations
+        
+        Books are scanned in worker processes when an executor is given; the
+        results are merged in book order, so the output matches a
+        sequential scan
+        """
         collection_path = Path(collection_name)
         
         if not collection_path.exists():
@@ -202,45 +339,17 @@ class MissingTranslationExtractor:
         book_folders = [f for f in collection_path.iterdir() 
                        if f.is_dir() and f.name.lower() != "pdfs"]
         
-        for book_folder in book_folders:
-            book_json_path = book_folder / "book.json"
-            
-            if not book_json_path.exists():
-                print(f"  ⚠️  No book.json in {book_folder.name}")
-                continue
-            
-            try:
-                # Scan book metadata
-                with open(book_json_path, 'r', encoding='utf-8') as f:
-                    book_data = json.load(f)
-                
-                self.scan_book_metadata(book_json_path, book_data)
-                self.stats['books_scanned'] += 1
-                
-                # Scan chapter content files
-                chapters_folder = book_folder / "chapters"
-                if chapters_folder.exists():
-                    chapter_files = list(chapters_folder.glob("*.json"))
-                    
-                    for chapter_file in chapter_files:
-                        try:
-                            with open(chapter_file, 'r', encoding='utf-8') as f:
-                                chapter_data = json.load(f)
-                            
-                            self.scan_chapter_content(chapter_file, chapter_data)
-                            self.stats['chapters_scanned'] += 1
-                            
-                            # Count sections
-                            sections = chapter_data.get('sections', [])
-                            self.stats['sections_scanned'] += len(sections)
-                            
-                        except Exception as e:
-                            print(f"    ❌ Error reading {chapter_file.name}: {e}")
-                
-                print(f"  ✓ {book_folder.name}")
-                
-            except Exception as e:
-                print(f"  ❌ Error reading {book_json_path}: {e}")
+        if executor is None:
+            for book_folder in book_folders:
+                for message in self.scan_book(book_folder):
+                    print(message)
+            return
+        
+        for missing_translations, stats, messages in executor.map(
+                _scan_book_worker, book_folders, chunksize=4):
+            self.merge_results(missing_translations, stats)
+            for message in messages:
+                print(message)
     
     def generate_translation_files(self):
         """Generate organized files for translation"""
@@ -280,19 +389,23 @@ class MissingTranslationExtractor:
             
             # Generate JSON for programmatic use
             json_file = output_dir / f"missing_{lang}_translations.json"
-            with open(json_file, 'w', encoding='utf-8') as f:
-                json.dump({
-                    'language': lang,
-                    'total_missing': len(sorted_items),
-                    'translations': {
-                        pali: {
-                            'contexts': contexts,
-                            'usage_count': len(contexts),
-                            'translation': ''
-                        }
-                        for pali, contexts in sorted_items
+            json_data = {
+                'language': lang,
+                'total_missing': len(sorted_items),
+                'translations': {
+                    pali: {
+                        'contexts': contexts,
+                        'usage_count': len(contexts),
+                        'translation': ''
                     }
-                }, f, ensure_ascii=False, indent=2)
+                    for pali, contexts in sorted_items
+                }
+            }
+            if orjson is not None:
+                json_file.write_bytes(orjson.dumps(json_data, option=orjson.OPT_INDENT_2))
+            else:
+                with open(json_file, 'w', encoding='utf-8') as f:
+                    json.dump(json_data, f, ensure_ascii=False, indent=2)
             
             # Generate prioritized batches for Google Translate quota
             batch_size = 20  # Google's free daily limit
@@ -363,9 +476,17 @@ class MissingTranslationExtractor:
         print("Missing Translation Extractor")
         print("=" * 60)
         
-        # Scan all collections
-        for collection in self.collections:
-            self.scan_collection(collection)
+        # Books are independent, so scan them in parallel processes when
+        # there is more than one CPU
+        workers = os.cpu_count() or 1
+        executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+        try:
+            # Scan all collections
+            for collection in self.collections:
+                self.scan_collection(collection, executor)
+        finally:
+            if executor is not None:
+                executor.shutdown()
         
         # Generate output files
         print(f"\n📊 Generating translation files...")
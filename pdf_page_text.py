@@ -0,0 +1,72 @@
+"""
+Shared PDF page text extraction for the *_correct.py extractors
+Reads the plain text of every page, splitting large PDFs into contiguous
+page ranges read in parallel processes
+"""
+
+import os
+import fitz  # PyMuPDF
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Tuple, Optional
+
+# Text extraction flags: the same ones page.get_text("text") uses, passed
+# explicitly because get_textpage defaults to none
+PAGE_TEXT_FLAGS = fitz.TEXTFLAGS_TEXT
+
+# Fewest pages worth handing to a separate extraction process
+MIN_PAGES_PER_WORKER = 25
+
+def extract_pages(pdf_path: str, start: int = 0, end: Optional[int] = None) -> List[str]:
+    """
+    Return the plain text of pages [start, end) of a PDF, in page order
+    
+    All PDF access goes through this module, so the text backend can be
+    swapped in one place. It opens the document itself so it can run in a
+    worker process (PyMuPDF documents are not thread-safe or picklable).
+    """
+    doc = fitz.open(pdf_path)
+    try:
+        return _read_pages(doc, start, len(doc) if end is None else end)
+    finally:
+        doc.close()
+
+def _read_pages(doc, start: int, end: int) -> List[str]:
+    """
+    Return the plain text of pages [start, end) of an open document
+    
+    Each page's text page is built once and read with extractText, skipping
+    the option handling and format dispatch of page.get_text.
+    """
+    texts = [''] * (end - start)
+    for page_num in range(start, end):
+        textpage = doc.load_page(page_num).get_textpage(flags=PAGE_TEXT_FLAGS)
+        texts[page_num - start] = textpage.extractText()
+    return texts
+
+def _extract_page_range(args: Tuple[str, int, int]) -> List[str]:
+    """Worker entry point: extract one (pdf_path, start, end) page range"""
+    return extract_pages(*args)
+
+def extract_pages_parallel(pdf_path: str) -> List[str]:
+    """
+    Return the plain text of every page, splitting the document into
+    contiguous page ranges extracted in parallel processes
+    """
+    doc = fitz.open(pdf_path)
+    try:
+        page_count = len(doc)
+        workers = min(os.cpu_count() or 1, page_count // MIN_PAGES_PER_WORKER)
+        if workers <= 1:
+            # Not worth extra processes: read from the document already open
+            return _read_pages(doc, 0, page_count)
+    finally:
+        doc.close()
+    
+    step = -(-page_count // workers)
+    ranges = [(pdf_path, start, min(start + step, page_count))
+              for start in range(0, page_count, step)]
+    
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        parts = list(executor.map(_extract_page_range, ranges))
+    
+    return [text for part in parts for text in part]
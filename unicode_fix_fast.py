@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Unicode fix core used by direct_unicode_fix.py
+
+Kept in its own fully type-annotated module so it can be compiled ahead of
+time for the whole-file bytes pass and the per-string ZWJ/NFC pass:
+
+    mypyc unicode_fix_fast.py
+
+The compiled extension shadows this file when present; without it the
+pure-Python version below is imported as usual.
+"""
+
+import json
+import re
+import unicodedata
+from typing import Dict, Tuple
+
+# Runs of two or more ZWJ characters
+_EXCESS_ZWJ_RE = re.compile(r'\u200D{2,}')
+
+# Escaped code points left behind as literal text
+_ESCAPES: Dict[str, str] = {
+    '\\u0DCA': '\u0DCA',
+    '\\u200D': '\u200D',
+    '\\u200C': '\u200C',
+    '\\u0D9A': '\u0D9A',
+    '\\u0DBB': '\u0DBB',
+    '\\u0DBA': '\u0DBA',
+    '\\u0DB8': '\u0DB8',
+}
+
+# Byte-level equivalents, applied to raw JSON file contents before parsing.
+# A literal backslash inside a JSON string is stored as an escaped pair, so
+# the escape pattern only matches an even run of backslashes followed by
+# the code point; an odd run is a real JSON escape and is left alone.
+_ZWJ_PLACEHOLDER_BYTES_RE = re.compile(rb'#zwj;|&zwj;')
+_UNICODE_LITERAL_BYTES_RE = re.compile(rb'\{U\+([0-9A-Fa-f]+)\}')
+_ESCAPE_BYTES_RE = re.compile(
+    rb'(?<!\\)((?:\\\\)*)\\\\u(' +
+    b'|'.join(escape[2:].encode('ascii') for escape in _ESCAPES) +
+    rb')'
+)
+_ZWJ_BYTES = '\u200D'.encode('utf-8')
+
+
+def collapse_excess_zwj(text: str) -> Tuple[str, int]:
+    """
+    Collapse runs of ZWJ characters, counting each removed character as a fix
+    """
+    if '\u200D\u200D' not in text:
+        return text, 0
+    collapsed = _EXCESS_ZWJ_RE.sub('\u200D', text)
+    return collapsed, len(text) - len(collapsed)
+
+
+def normalize_nfc(text: str) -> Tuple[str, int]:
+    """
+    NFC-normalize text, counting one fix when it changes
+
+    Pure-ASCII strings are already normalized and skip the Unicode tables.
+    """
+    if text.isascii() or unicodedata.is_normalized('NFC', text):
+        return text, 0
+    return unicodedata.normalize('NFC', text), 1
+
+
+def _json_char_bytes(char: str) -> bytes:
+    """
+    Encode a single character as it must appear inside a JSON string
+    """
+    if '\uD800' <= char <= '\uDFFF':
+        return json.dumps(char)[1:-1].encode('ascii')
+    return json.dumps(char, ensure_ascii=False)[1:-1].encode('utf-8')
+
+
+def fix_unicode_bytes(buf: bytes) -> Tuple[bytes, int]:
+    """
+    Apply the literal Unicode fixes to raw JSON bytes
+
+    Every target sequence is ASCII, so this runs before decoding and parsing.
+    Excessive ZWJ runs must still be collapsed on the parsed strings with
+    collapse_excess_zwj, since ZWJ may be stored as a JSON escape.
+
+    Working on the raw bytes differs from fixing the parsed strings in two
+    ways, neither of which occurs in the chapter files:
+
+    - object keys are rewritten too ("k#zwj;" becomes "k\\u200d")
+    - placeholders spelled with JSON escapes (e.g. "\\u0023zwj;") are not
+      seen, since they only become "#zwj;" once parsed
+    """
+    fixes = 0
+
+    # 1-2. #zwj; placeholders and &zwj; HTML entities
+    if b'zwj;' in buf:
+        buf, count = _ZWJ_PLACEHOLDER_BYTES_RE.subn(_ZWJ_BYTES, buf)
+        fixes += count
+
+    # 3. {U+200D} literal notation
+    def replace_unicode_literal(match: re.Match) -> bytes:
+        nonlocal fixes
+        try:
+            char = chr(int(match.group(1), 16))
+        except (ValueError, OverflowError):
+            return match.group(0)
+        fixes += 1
+        return _json_char_bytes(char)
+
+    if b'{U+' in buf:
+        buf = _UNICODE_LITERAL_BYTES_RE.sub(replace_unicode_literal, buf)
+
+    # 4. Unicode escapes stored as literal text
+    if b'\\\\u' in buf:
+        def replace_escape(match: re.Match) -> bytes:
+            char = _ESCAPES['\\u' + match.group(2).decode('ascii')]
+            return match.group(1) + char.encode('utf-8')
+
+        buf, count = _ESCAPE_BYTES_RE.subn(replace_escape, buf)
+        fixes += count
+
+    return buf, fixes